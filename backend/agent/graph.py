@@ -1,5 +1,6 @@
 """LangGraph definition for the Edesia agent."""
 
+import functools
 from typing import Literal, Optional
 from langgraph.graph import StateGraph, END
 from langgraph.checkpoint.base import BaseCheckpointSaver
@@ -120,7 +121,17 @@ def create_agent_graph(checkpointer: Optional[BaseCheckpointSaver] = None) -> St
     The preferences node runs first to:
     - Load user food preferences from Redis
     - Detect and save new preferences mentioned in the message
+
+    The graph structure doesn't depend on the checkpointer, so it is built
+    once per process and only compiled per call.
     """
+    # Compile the graph with optional checkpointer for persistent memory
+    return _build_graph().compile(checkpointer=checkpointer)
+
+
+@functools.cache
+def _build_graph() -> StateGraph:
+    """Build the (uncompiled) agent graph: nodes, edges, and routing."""
 
     # Create the graph with our state schema
     graph = StateGraph(AgentState)
@@ -173,5 +184,4 @@ def create_agent_graph(checkpointer: Optional[BaseCheckpointSaver] = None) -> St
     graph.add_edge("approval", END)
     graph.add_edge("summarizer", END)
 
-    # Compile the graph with optional checkpointer for persistent memory
-    return graph.compile(checkpointer=checkpointer)
+    return graph
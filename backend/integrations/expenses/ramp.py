@@ -1,8 +1,11 @@
 """Ramp expense provider implementation."""
 
 import os
+import asyncio
 import logging
+import weakref
 import httpx
+import orjson
 
 from integrations.expenses.base import ExpenseProvider, ExpenseResult
 from models.integrations import ExpenseEntry
@@ -11,6 +14,40 @@ logger = logging.getLogger(__name__)
 
 RAMP_API_BASE = "https://demo-api.ramp.com/developer/v1"
 
+# Max characters of a JSON error body to include in logs
+_ERROR_BODY_LOG_LIMIT = 1024
+
+# Pooled clients, one per event loop (agent tools may run on their own loops)
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+
+
+def _get_client() -> httpx.AsyncClient:
+    """Get the pooled Ramp HTTP client for the running event loop.
+
+    Reusing one client keeps TLS connections alive across requests, so bursts
+    of reimbursements don't pay a fresh connect + handshake each.
+    """
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            timeout=30.0,
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+        )
+        _clients[loop] = client
+    return client
+
+
+def _error_detail(response: httpx.Response) -> str:
+    """Summarize an error response for logging without dumping large bodies.
+
+    Only JSON error bodies are decoded (and truncated); anything else, such as
+    proxy HTML pages, is reported by size alone.
+    """
+    if response.headers.get("content-type", "").startswith("application/json"):
+        return response.text[:_ERROR_BODY_LOG_LIMIT]
+    return f"<{len(response.content)} bytes suppressed>"
+
 
 class RampProvider(ExpenseProvider):
     """Create expenses via the Ramp API."""
@@ -42,30 +79,28 @@ class RampProvider(ExpenseProvider):
             payload["department"] = expense.cost_center
 
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{RAMP_API_BASE}/reimbursements",
-                    json=payload,
-                    headers=self.headers,
-                    timeout=30.0,
-                )
+            response = await _get_client().post(
+                f"{RAMP_API_BASE}/reimbursements",
+                content=orjson.dumps(payload),
+                headers=self.headers,
+            )
 
-                if response.status_code in (200, 201):
-                    data = response.json()
-                    return ExpenseResult(
-                        expense_id=data.get("id", expense.expense_id),
-                        status="submitted",
-                        provider="ramp",
-                        message="Expense submitted to Ramp.",
-                    )
-                else:
-                    logger.error(f"Ramp API error {response.status_code}: {response.text}")
-                    return ExpenseResult(
-                        expense_id=expense.expense_id,
-                        status="failed",
-                        provider="ramp",
-                        message=f"Ramp API error: {response.status_code}",
-                    )
+            if response.status_code in (200, 201):
+                data = orjson.loads(response.content)
+                return ExpenseResult(
+                    expense_id=data.get("id", expense.expense_id),
+                    status="submitted",
+                    provider="ramp",
+                    message="Expense submitted to Ramp.",
+                )
+            else:
+                logger.error(f"Ramp API error {response.status_code}: {_error_detail(response)}")
+                return ExpenseResult(
+                    expense_id=expense.expense_id,
+                    status="failed",
+                    provider="ramp",
+                    message=f"Ramp API error: {response.status_code}",
+                )
 
         except Exception as e:
             logger.error(f"Ramp expense creation failed: {e}")
@@ -79,14 +114,12 @@ class RampProvider(ExpenseProvider):
     async def attach_receipt(self, expense_id: str, receipt_url: str, receipt_data: dict) -> bool:
         """Attach receipt to a Ramp expense."""
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{RAMP_API_BASE}/reimbursements/{expense_id}/receipt",
-                    json={"receipt_url": receipt_url},
-                    headers=self.headers,
-                    timeout=30.0,
-                )
-                return response.status_code in (200, 201)
+            response = await _get_client().post(
+                f"{RAMP_API_BASE}/reimbursements/{expense_id}/receipt",
+                content=orjson.dumps({"receipt_url": receipt_url}),
+                headers=self.headers,
+            )
+            return response.status_code in (200, 201)
         except Exception as e:
             logger.error(f"Ramp receipt attachment failed: {e}")
             return False
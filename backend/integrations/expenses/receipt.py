@@ -1,8 +1,8 @@
 """Receipt generation for expense attachment."""
 
-import io
 import logging
-from typing import Optional
+import tempfile
+from typing import Callable, Optional
 from datetime import datetime
 
 from models.integrations import ReceiptData
@@ -10,6 +10,11 @@ from models.orders import FoodOrderContext
 
 logger = logging.getLogger(__name__)
 
+_PDF_SPOOL_MAX_BYTES = 64 * 1024
+
+_pdf_styles = None
+_pdf_table_style = None
+
 
 def build_receipt(order: FoodOrderContext, payment_data: Optional[dict] = None) -> ReceiptData:
     """Build structured receipt data from a completed food order.
@@ -61,6 +66,17 @@ def build_receipt(order: FoodOrderContext, payment_data: Optional[dict] = None)
     )
 
 
+def _item_getter(items: list) -> Callable:
+    """Pick a (name, quantity, price) extractor for the receipt's item shape.
+
+    Items are either all dicts or all OrderItem models, so the shape is
+    checked once from the first item instead of per row.
+    """
+    if items and isinstance(items[0], dict):
+        return lambda i: (i.get("name", ""), i.get("quantity", 1), i.get("price", 0))
+    return lambda i: (i.name, i.quantity, i.price)
+
+
 def render_receipt_text(receipt: ReceiptData) -> str:
     """Render receipt as plain text (for CSV and Slack)."""
     lines = [
@@ -71,15 +87,7 @@ def render_receipt_text(receipt: ReceiptData) -> str:
         "Items:",
     ]
 
-    for item in receipt.items:
-        if isinstance(item, dict):
-            name = item.get("name", "")
-            qty = item.get("quantity", 1)
-            price = item.get("price", 0)
-        else:
-            name = item.name
-            qty = item.quantity
-            price = item.price
+    for name, qty, price in map(_item_getter(receipt.items), receipt.items):
         lines.append(f"  {qty}x {name} — ${price * qty:.2f}")
 
     lines.extend([
@@ -103,6 +111,33 @@ def render_receipt_text(receipt: ReceiptData) -> str:
     return "\n".join(lines)
 
 
+def _get_pdf_styles():
+    """Get the shared ReportLab paragraph and table styles, building them once.
+
+    Both are pure configuration objects, so a single instance is reused across
+    receipts instead of being reconstructed per render.
+    """
+    global _pdf_styles, _pdf_table_style
+
+    if _pdf_styles is not None:
+        return _pdf_styles, _pdf_table_style
+
+    from reportlab.platypus import TableStyle
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.lib import colors
+
+    _pdf_table_style = TableStyle([
+        ("BACKGROUND", (0, 0), (-1, 0), colors.grey),
+        ("TEXTCOLOR", (0, 0), (-1, 0), colors.whitesmoke),
+        ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+        ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
+        ("ALIGN", (0, 0), (0, -1), "CENTER"),
+        ("ALIGN", (2, 0), (2, -1), "RIGHT"),
+    ])
+    _pdf_styles = getSampleStyleSheet()
+    return _pdf_styles, _pdf_table_style
+
+
 def render_receipt_pdf(receipt: ReceiptData) -> bytes:
     """Render receipt as a PDF using ReportLab.
 
@@ -111,47 +146,34 @@ def render_receipt_pdf(receipt: ReceiptData) -> bytes:
     """
     from reportlab.lib.pagesizes import letter
     from reportlab.lib.units import inch
-    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-    from reportlab.lib.styles import getSampleStyleSheet
-    from reportlab.lib import colors
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table
+
+    styles, table_style = _get_pdf_styles()
+    normal = styles["Normal"]
 
-    buffer = io.BytesIO()
+    # Small receipts stay in memory; large ones spill to disk instead of RAM
+    buffer = tempfile.SpooledTemporaryFile(max_size=_PDF_SPOOL_MAX_BYTES)
     doc = SimpleDocTemplate(buffer, pagesize=letter, topMargin=0.75 * inch)
-    styles = getSampleStyleSheet()
     story = []
 
     # Header
     story.append(Paragraph(f"<b>Receipt — {receipt.vendor_name}</b>", styles["Title"]))
-    story.append(Paragraph(f"Date: {receipt.date} | Order: {receipt.order_id}", styles["Normal"]))
+    story.append(Paragraph(f"Date: {receipt.date} | Order: {receipt.order_id}", normal))
     story.append(Spacer(1, 12))
 
     # Items table
-    table_data = [["Qty", "Item", "Price"]]
-    for item in receipt.items:
-        if isinstance(item, dict):
-            name = item.get("name", "")
-            qty = item.get("quantity", 1)
-            price = item.get("price", 0)
-        else:
-            name = item.name
-            qty = item.quantity
-            price = item.price
-        table_data.append([str(qty), name, f"${price * qty:.2f}"])
-
-    if len(table_data) > 1:
+    if receipt.items:
+        table_data = [["Qty", "Item", "Price"]]
+        table_data.extend(
+            [str(qty), name, f"${price * qty:.2f}"]
+            for name, qty, price in map(_item_getter(receipt.items), receipt.items)
+        )
         table = Table(table_data, colWidths=[0.5 * inch, 4 * inch, 1.2 * inch])
-        table.setStyle(TableStyle([
-            ("BACKGROUND", (0, 0), (-1, 0), colors.grey),
-            ("TEXTCOLOR", (0, 0), (-1, 0), colors.whitesmoke),
-            ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-            ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
-            ("ALIGN", (0, 0), (0, -1), "CENTER"),
-            ("ALIGN", (2, 0), (2, -1), "RIGHT"),
-        ]))
+        table.setStyle(table_style)
         story.append(table)
         story.append(Spacer(1, 12))
 
-    # Totals
+    # Totals (single flowable)
     totals = [
         f"Subtotal: ${receipt.subtotal:.2f}",
         f"Tax: ${receipt.tax:.2f}",
@@ -161,12 +183,13 @@ def render_receipt_pdf(receipt: ReceiptData) -> bytes:
         totals.append(f"Tip/Service: ${receipt.tip:.2f}")
     totals.append(f"<b>Total: ${receipt.total:.2f}</b>")
 
-    for line in totals:
-        story.append(Paragraph(line, styles["Normal"]))
+    story.append(Paragraph("<br/>".join(totals), normal))
 
     story.append(Spacer(1, 12))
-    story.append(Paragraph(f"Payment: {receipt.payment_method}", styles["Normal"]))
-    story.append(Paragraph(f"Attendees: {receipt.attendee_count} | Per person: ${receipt.per_person_cost:.2f}", styles["Normal"]))
+    story.append(Paragraph(f"Payment: {receipt.payment_method}", normal))
+    story.append(Paragraph(f"Attendees: {receipt.attendee_count} | Per person: ${receipt.per_person_cost:.2f}", normal))
 
-    doc.build(story)
-    return buffer.getvalue()
+    with buffer:
+        doc.build(story)
+        buffer.seek(0)
+        return buffer.read()
@@ -8,11 +8,27 @@ from models.integrations import AttendeeReport
 logger = logging.getLogger(__name__)
 
 
+# Firestore caps the number of values in an "in" filter
+_IN_QUERY_LIMIT = 30
+
+
+def _build_entry(email: str, user_data: Optional[dict]) -> dict:
+    """Build the per-attendee breakdown entry for one email."""
+    if not user_data:
+        return {"name": email.split("@")[0], "restrictions": [], "allergies": []}
+
+    return {
+        "name": user_data.get("displayName") or user_data.get("companyName") or email.split("@")[0],
+        "restrictions": user_data.get("dietaryRestrictions", []) or [],
+        "allergies": user_data.get("allergies", []) or [],
+    }
+
+
 async def resolve_attendees(attendee_emails: list[str]) -> AttendeeReport:
     """Resolve calendar attendees to Edesia users and aggregate dietary info.
 
     For each attendee email:
-    1. Look up Firebase user by email
+    1. Look up Firebase user by email (batched "in" queries)
     2. Load their food preferences from Firestore
     3. Aggregate dietary restrictions and allergies across all attendees
 
@@ -26,43 +42,22 @@ async def resolve_attendees(attendee_emails: list[str]) -> AttendeeReport:
 
     db = get_db()
 
-    all_restrictions = set()
-    all_allergies = set()
-    per_attendee = {}
-    unknown = []
+    unique_emails = list(dict.fromkeys(attendee_emails))
+    email_to_userdata: dict[str, dict] = {}
 
-    for email in attendee_emails:
-        # Look up user by email
-        users = db.collection("users").where("email", "==", email).limit(1).stream()
-
-        user_data = None
-        for doc in users:
+    for i in range(0, len(unique_emails), _IN_QUERY_LIMIT):
+        chunk = unique_emails[i:i + _IN_QUERY_LIMIT]
+        for doc in db.collection("users").where("email", "in", chunk).stream():
             user_data = doc.to_dict()
-            break
-
-        if not user_data:
-            unknown.append(email)
-            per_attendee[email] = {"name": email.split("@")[0], "restrictions": [], "allergies": []}
-            continue
-
-        # Extract preferences
-        name = user_data.get("displayName") or user_data.get("companyName") or email.split("@")[0]
-        restrictions = user_data.get("dietaryRestrictions", []) or []
-        allergies = user_data.get("allergies", []) or []
-
-        all_restrictions.update(restrictions)
-        all_allergies.update(allergies)
+            email_to_userdata.setdefault(user_data.get("email"), user_data)
 
-        per_attendee[email] = {
-            "name": name,
-            "restrictions": restrictions,
-            "allergies": allergies,
-        }
+    per_attendee = {e: _build_entry(e, email_to_userdata.get(e)) for e in attendee_emails}
+    unknown = [e for e in attendee_emails if e not in email_to_userdata]
 
     return AttendeeReport(
         headcount=len(attendee_emails),
-        dietary_restrictions=sorted(all_restrictions),
-        allergies=sorted(all_allergies),
+        dietary_restrictions=sorted({r for v in per_attendee.values() for r in v["restrictions"]}),
+        allergies=sorted({a for v in per_attendee.values() for a in v["allergies"]}),
         per_attendee=per_attendee,
         unknown_attendees=unknown,
     )
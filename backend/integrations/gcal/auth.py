@@ -2,6 +2,7 @@
 
 import os
 import logging
+from contextvars import ContextVar
 from typing import Optional
 from datetime import datetime
 
@@ -28,6 +29,16 @@ CLIENT_CONFIG = {
 }
 
 
+# Per-request credential cache: user_id -> Credentials (or None if not connected).
+# Stays None outside a request scope, in which case nothing is cached.
+_request_credentials: ContextVar[Optional[dict]] = ContextVar("_request_credentials", default=None)
+
+
+def reset_credentials_cache() -> None:
+    """Start a fresh credential cache for the current request context."""
+    _request_credentials.set({})
+
+
 def get_auth_url(user_id: str, redirect_uri: str) -> str:
     """Generate Google OAuth2 authorization URL.
 
@@ -82,12 +93,28 @@ async def handle_oauth_callback(code: str, user_id: str, redirect_uri: str) -> d
 async def get_credentials(user_id: str) -> Optional[Credentials]:
     """Load stored Google credentials, refreshing if expired.
 
+    Within a request scope (see reset_credentials_cache) the result is cached,
+    so repeated calls for the same user only hit Firestore once.
+
     Args:
         user_id: Firebase user ID.
 
     Returns:
         Google Credentials object, or None if not connected.
     """
+    cache = _request_credentials.get()
+    if cache is not None and user_id in cache:
+        return cache[user_id]
+
+    creds = await _load_credentials(user_id)
+
+    if cache is not None:
+        cache[user_id] = creds
+    return creds
+
+
+async def _load_credentials(user_id: str) -> Optional[Credentials]:
+    """Read credentials from Firestore, refreshing and persisting if expired."""
     db = get_db()
     doc = db.collection("users").document(user_id).get()
 
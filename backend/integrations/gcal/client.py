@@ -1,18 +1,40 @@
 """Google Calendar API client operations."""
 
+import functools
+import json
 import logging
+import sys
 from typing import Optional
 from datetime import datetime, timedelta
 
-from googleapiclient.discovery import build
+from googleapiclient.discovery import build_from_document
+from googleapiclient.discovery_cache import get_static_doc
 from models.integrations import CalendarEvent
 
 logger = logging.getLogger(__name__)
 
 
+# Python 3.11+ parses a trailing "Z" natively; older versions need it rewritten
+if sys.version_info >= (3, 11):
+    _fromisoformat = datetime.fromisoformat
+else:
+    def _fromisoformat(value: str) -> datetime:
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+@functools.cache
+def _get_discovery_doc() -> dict:
+    """Load the Calendar v3 discovery document bundled with the client library.
+
+    Parsed once per process so building a service never fetches or re-parses
+    the discovery document.
+    """
+    return json.loads(get_static_doc("calendar", "v3"))
+
+
 def _get_service(credentials):
     """Build a Google Calendar API service object."""
-    return build("calendar", "v3", credentials=credentials)
+    return build_from_document(_get_discovery_doc(), credentials=credentials)
 
 
 async def get_event_details(user_id: str, event_id: str) -> Optional[CalendarEvent]:
@@ -102,8 +124,8 @@ async def create_lunch_event(
 
     # Parse delivery time
     try:
-        dt = datetime.fromisoformat(delivery_time.replace("Z", "+00:00"))
-    except (ValueError, AttributeError):
+        dt = _fromisoformat(delivery_time)
+    except (ValueError, AttributeError, TypeError):
         dt = datetime.utcnow() + timedelta(hours=1)
 
     end_time = dt + timedelta(minutes=45)  # 45-min lunch window
@@ -198,13 +220,13 @@ def _parse_event(event: dict) -> CalendarEvent:
 
     # Parse datetime strings
     try:
-        start_dt = datetime.fromisoformat(start_time.replace("Z", "+00:00"))
-    except (ValueError, AttributeError):
+        start_dt = _fromisoformat(start_time)
+    except (ValueError, AttributeError, TypeError):
         start_dt = datetime.utcnow()
 
     try:
-        end_dt = datetime.fromisoformat(end_time.replace("Z", "+00:00"))
-    except (ValueError, AttributeError):
+        end_dt = _fromisoformat(end_time)
+    except (ValueError, AttributeError, TypeError):
         end_dt = start_dt + timedelta(hours=1)
 
     attendees = event.get("attendees", [])
@@ -7,15 +7,36 @@ using the same graph, checkpointer, and state shape as the web chat endpoint.
 import logging
 from typing import Optional
 
+from pydantic import TypeAdapter
+
+from agent import create_agent_graph
+from lib.firebase import get_db
+from lib.redis import get_async_checkpointer, get_user_preferences
+from lib.ttl_cache import TTLCache
 from models.integrations import SlackContext
+from models.orders import FoodOrderContext, VendorOption
+from integrations.slack.approval import get_actions_dict
 from integrations.slack.messages import (
     agent_response_to_blocks,
     build_order_summary_blocks,
     build_vendor_options_blocks,
 )
+from integrations.slack.rate_limit import slack_call
 
 logger = logging.getLogger(__name__)
 
+_VENDORS_ADAPTER = TypeAdapter(list[VendorOption])
+
+# Slack caps the top-level message text at 3000 characters
+SLACK_TEXT_LIMIT = 3000
+
+# Short-lived per-user cache so chatty Slack threads don't re-read the
+# profile (Firestore) on every message. Preferences are not cached: they
+# change mid-conversation (the agent saves them) and the Redis read is cheap.
+_USER_CACHE_TTL_SECONDS = 60
+_profile_cache = TTLCache(maxsize=10_000, ttl=_USER_CACHE_TTL_SECONDS)
+_MISSING = object()
+
 
 async def invoke_agent_for_slack(
     session_id: str,
@@ -39,29 +60,34 @@ async def invoke_agent_for_slack(
         client: Slack WebClient for posting messages.
         thread_ts: Optional thread timestamp to reply in a thread.
     """
-    from agent import create_agent_graph
-    from lib.redis import get_async_checkpointer, get_user_preferences
-
     user_id = slack_context.firebase_user_id or "anonymous"
-    user_preferences = get_user_preferences(user_id) if user_id != "anonymous" else None
-
-    # Load user profile from Firestore if linked
+    user_preferences = None
     user_profile = None
+
     if user_id != "anonymous":
-        try:
-            from lib.firebase import get_db
-            db = get_db()
-            user_doc = db.collection("users").document(user_id).get()
-            if user_doc.exists:
-                user_profile = user_doc.to_dict()
-        except Exception as e:
-            logger.warning(f"Failed to load user profile: {e}")
+        user_preferences = get_user_preferences(user_id)
+
+        # Load user profile from Firestore if linked
+        user_profile = _profile_cache.get(user_id, _MISSING)
+        if user_profile is _MISSING:
+            user_profile = None
+            try:
+                db = get_db()
+                user_doc = db.collection("users").document(user_id).get()
+                if user_doc.exists:
+                    user_profile = user_doc.to_dict()
+                _profile_cache.set(user_id, user_profile)
+            except Exception as e:
+                logger.warning(f"Failed to load user profile: {e}")
 
     # Determine timezone from user profile or default
     timezone = None
     if user_profile:
         timezone = user_profile.get("timezone", "America/New_York")
 
+    # Serialized once and shared by the graph input and stored pending actions
+    slack_context_dump = slack_context.model_dump()
+
     try:
         async with get_async_checkpointer() as checkpointer:
             graph = create_agent_graph(checkpointer=checkpointer)
@@ -95,27 +121,25 @@ async def invoke_agent_for_slack(
                 "has_images": False,
                 "chat_id": None,  # Slack sessions don't use Firestore chat docs
                 "source_channel": "slack",
-                "slack_context": slack_context.model_dump(),
+                "slack_context": slack_context_dump,
             }
 
             result = await graph.ainvoke(initial_input, config=config)
 
         # Extract response
-        last_message = result.get("messages", [])[-1] if result.get("messages") else None
-        response_text = ""
-        if last_message:
-            response_text = (
-                last_message.content
-                if hasattr(last_message, "content")
-                else last_message.get("content", "")
-            )
+        messages = result.get("messages")
+        last_message = messages[-1] if messages else None
+        response_text = (
+            getattr(last_message, "content", None)
+            or (last_message.get("content", "") if isinstance(last_message, dict) else "")
+        )
 
         pending_actions = result.get("pending_actions", [])
 
         # Post response to Slack
         post_kwargs = {
             "channel": slack_context.channel_id,
-            "text": response_text[:3000],  # Fallback text
+            "text": response_text[:SLACK_TEXT_LIMIT],  # Fallback text
         }
 
         if thread_ts or slack_context.thread_ts:
@@ -128,13 +152,8 @@ async def invoke_agent_for_slack(
         if cached_vendors and isinstance(cached_vendors, dict):
             vendor_options = cached_vendors.get("vendors", [])
             if vendor_options:
-                from models.orders import VendorOption
-                vendors = []
-                for v in vendor_options:
-                    if isinstance(v, dict):
-                        vendors.append(VendorOption(**v))
-                    else:
-                        vendors.append(v)
+                # Dicts are validated; existing VendorOption instances pass through
+                vendors = _VENDORS_ADAPTER.validate_python(vendor_options)
                 blocks = build_vendor_options_blocks(vendors, session_id)
                 post_kwargs["blocks"] = blocks
 
@@ -142,7 +161,6 @@ async def invoke_agent_for_slack(
             # Show approve/reject buttons for pending actions
             for action in pending_actions:
                 if food_order:
-                    from models.orders import FoodOrderContext
                     fo = (
                         FoodOrderContext(**food_order)
                         if isinstance(food_order, dict)
@@ -157,20 +175,20 @@ async def invoke_agent_for_slack(
                 blocks = agent_response_to_blocks(response_text)
                 post_kwargs["blocks"] = blocks
 
-        await client.chat_postMessage(**post_kwargs)
+        await slack_call(slack_context.team_id, client.chat_postMessage(**post_kwargs))
 
         # Store pending actions in Modal dict for approval lookup
         if pending_actions:
-            import modal
-            actions_dict = modal.Dict.from_name("edesia-actions", create_if_missing=True)
+            actions_dict = get_actions_dict()
             for action in pending_actions:
-                action["slack_context"] = slack_context.model_dump()
-                actions_dict[action["action_id"]] = action
+                action["slack_context"] = slack_context_dump
+            # One bulk write instead of a round-trip per action
+            await actions_dict.update.aio(**{a["action_id"]: a for a in pending_actions})
 
     except Exception as e:
         logger.error(f"Agent invocation failed for Slack: {e}", exc_info=True)
-        await client.chat_postMessage(
+        await slack_call(slack_context.team_id, client.chat_postMessage(
             channel=slack_context.channel_id,
             text="Something went wrong processing your request. Please try again.",
             thread_ts=thread_ts or slack_context.thread_ts,
-        )
+        ))
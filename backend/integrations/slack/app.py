@@ -2,9 +2,12 @@
 
 import os
 import logging
-from slack_bolt import App
-from slack_bolt.adapter.starlette import SlackRequestHandler
-from slack_bolt.oauth.oauth_settings import OAuthSettings
+from slack_bolt.async_app import AsyncApp
+from slack_bolt.adapter.starlette.async_handler import AsyncSlackRequestHandler
+from slack_bolt.oauth.async_oauth_settings import AsyncOAuthSettings
+from slack_sdk.web.async_client import AsyncWebClient
+
+from integrations.slack.client_pool import get_shared_session
 
 from integrations.slack.oauth_store import (
     FirestoreInstallationStore,
@@ -17,10 +20,13 @@ installation_store = FirestoreInstallationStore()
 state_store = FirestoreOAuthStateStore(expiration_seconds=600)
 
 # Multi-workspace OAuth mode: Bolt looks up bot tokens per-workspace
-# from Firestore via the installation store.
-slack_app = App(
+# from Firestore via the installation store. The tokenless base client only
+# carries the shared HTTP session (attached per request, see below), which
+# Bolt copies into each handler's per-request client.
+slack_app = AsyncApp(
     signing_secret=os.environ.get("SLACK_SIGNING_SECRET", ""),
-    oauth_settings=OAuthSettings(
+    client=AsyncWebClient(),
+    oauth_settings=AsyncOAuthSettings(
         client_id=os.environ.get("SLACK_CLIENT_ID", ""),
         client_secret=os.environ.get("SLACK_CLIENT_SECRET", ""),
         scopes=[
@@ -30,6 +36,7 @@ slack_app = App(
             "im:history",
             "im:write",
             "channels:history",
+            "reactions:write",
         ],
         installation_store=installation_store,
         state_store=state_store,
@@ -40,7 +47,18 @@ slack_app = App(
 )
 
 # Starlette adapter for FastAPI integration
-slack_handler = SlackRequestHandler(slack_app)
+slack_handler = AsyncSlackRequestHandler(slack_app)
+
+
+async def handle_slack_request(request):
+    """Dispatch a Starlette request to Bolt over the shared HTTP session.
+
+    The aiohttp session has to be created on the running event loop, so it is
+    attached here rather than at import time. get_shared_session() returns the
+    existing session after the first call (or a new one if it was closed).
+    """
+    slack_app.client.session = get_shared_session()
+    return await slack_handler.handle(request)
 
 
 def register_handlers():
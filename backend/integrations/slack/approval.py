@@ -1,11 +1,31 @@
 """Execute approved actions from Slack (mirrors /approve endpoint logic)."""
 
+import functools
 import logging
 from typing import Optional
+from datetime import datetime
+
+import modal
+
+from integrations.slack.async_batcher import KVBatcher
+from lib.firebase import get_db
+from lib.stripe_client import charge_customer, get_or_create_customer
+from tools.doordash_delivery import create_delivery
+from tools.vapi_calls import call_restaurant
 
 logger = logging.getLogger(__name__)
 
 
+@functools.cache
+def get_actions_dict() -> modal.Dict:
+    """Get the Modal Dict holding pending actions (looked up once per process)."""
+    return modal.Dict.from_name("edesia-actions", create_if_missing=True)
+
+
+# Coalesces concurrent approval/rejection writes into bulk Dict updates
+actions_batcher = KVBatcher(get_actions_dict)
+
+
 async def execute_slack_approval(
     action_id: str,
     stored_action: dict,
@@ -25,9 +45,6 @@ async def execute_slack_approval(
     Returns:
         Dict with 'message' on success or 'error' on failure.
     """
-    import modal
-    from datetime import datetime
-
     action_type = stored_action.get("action_type", "")
     payload = stored_action.get("payload", {})
 
@@ -36,8 +53,7 @@ async def execute_slack_approval(
         stored_action["status"] = "approved"
         stored_action["approved_by"] = approved_by_slack_id
         stored_action["approved_at"] = datetime.utcnow().isoformat()
-        actions_dict = modal.Dict.from_name("edesia-actions", create_if_missing=True)
-        actions_dict[action_id] = stored_action
+        await actions_batcher.put(action_id, stored_action)
 
         # Execute based on action type
         if action_type in ("food_order", "doordash_order"):
@@ -60,9 +76,6 @@ async def execute_slack_approval(
 
 async def _execute_food_order(action: dict, payload: dict) -> dict:
     """Execute an approved food order (charge card + create DoorDash delivery)."""
-    from lib.stripe_client import charge_customer, get_or_create_customer
-    from lib.firebase import get_db
-
     slack_ctx = action.get("slack_context", {})
     firebase_user_id = slack_ctx.get("firebase_user_id")
 
@@ -100,7 +113,6 @@ async def _execute_food_order(action: dict, payload: dict) -> dict:
 
     # Create DoorDash delivery
     try:
-        from tools.doordash_delivery import create_delivery
         delivery_result = create_delivery.invoke({
             "pickup_address": payload.get("pickup_address", ""),
             "pickup_business_name": payload.get("vendor_name", ""),
@@ -125,8 +137,6 @@ async def _execute_food_order(action: dict, payload: dict) -> dict:
 
 async def _execute_call(action: dict, payload: dict) -> dict:
     """Execute an approved phone call via Vapi."""
-    from tools.vapi_calls import call_restaurant
-
     try:
         result = call_restaurant.invoke({
             "restaurant_name": payload.get("restaurant_name", payload.get("name", "")),
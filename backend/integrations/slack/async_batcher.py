@@ -0,0 +1,73 @@
+"""Coalesce concurrent key/value writes into bulk Modal Dict updates.
+
+Bursts of approvals each write one pending action back to the Modal Dict.
+Writes arriving within a short window are grouped into a single bulk
+update() call instead of one RPC per write.
+"""
+
+import asyncio
+import logging
+from typing import Any, Callable
+
+logger = logging.getLogger(__name__)
+
+
+class KVBatcher:
+    """Group put() calls made within `max_delay` seconds into one bulk update.
+
+    Each put() waits until its batch has been written, so callers keep the
+    same durability guarantee as a direct write.
+    """
+
+    def __init__(
+        self,
+        get_target: Callable[[], Any],
+        max_items: int = 100,
+        max_delay: float = 0.02,
+    ):
+        self._get_target = get_target
+        self.max_items = max_items
+        self.max_delay = max_delay
+        self._pending: dict = {}
+        self._waiters: list[asyncio.Future] = []
+        self._full = asyncio.Event()
+        self._flush_task = None
+
+    async def put(self, key: str, value: Any) -> None:
+        """Queue a write and wait for the batch containing it to be flushed."""
+        waiter = asyncio.get_running_loop().create_future()
+        self._pending[key] = value  # Later writes to the same key win
+        self._waiters.append(waiter)
+
+        if len(self._pending) >= self.max_items:
+            self._full.set()
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_soon())
+
+        await waiter
+
+    async def _flush_soon(self):
+        """Wait for the batch window (or a full batch), then write it."""
+        try:
+            await asyncio.wait_for(self._full.wait(), self.max_delay)
+        except asyncio.TimeoutError:
+            pass
+
+        batch, waiters = self._pending, self._waiters
+        self._pending, self._waiters = {}, []
+        self._full.clear()
+        self._flush_task = None
+
+        try:
+            target = self._get_target()
+            await target.update.aio(**batch)  # Dict.update is keyword-only on older modal
+        except Exception as e:
+            logger.error(f"Batched write of {len(batch)} keys failed: {e}")
+            for waiter in waiters:
+                if not waiter.done():
+                    waiter.set_exception(e)
+            return
+
+        for waiter in waiters:
+            if not waiter.done():
+                waiter.set_result(None)
@@ -0,0 +1,34 @@
+"""Run Slack handler work in the background after the request is acked.
+
+Slack expects an ack within 3 seconds; anything slower (Firestore, Modal,
+agent invocation) is handed off here so the handler can return right away.
+"""
+
+import asyncio
+import logging
+from typing import Coroutine
+
+logger = logging.getLogger(__name__)
+
+# Strong references so in-flight tasks aren't garbage-collected
+_tasks: set[asyncio.Task] = set()
+
+
+def spawn(coro: Coroutine, description: str) -> asyncio.Task:
+    """Schedule a coroutine as a background task, logging any failure.
+
+    Args:
+        coro: The handler work to run.
+        description: Short label used in error logs.
+    """
+    task = asyncio.create_task(_run_logged(coro, description))
+    _tasks.add(task)
+    task.add_done_callback(_tasks.discard)
+    return task
+
+
+async def _run_logged(coro: Coroutine, description: str):
+    try:
+        await coro
+    except Exception as e:
+        logger.error(f"Background Slack work failed ({description}): {e}", exc_info=True)
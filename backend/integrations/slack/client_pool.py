@@ -0,0 +1,44 @@
+"""Shared HTTP connection pool for Slack Web API clients.
+
+Every AsyncWebClient we construct reuses one aiohttp session, so
+chat_postMessage / chat_update calls ride keep-alive connections instead of
+paying a TLS handshake per call.
+"""
+
+import logging
+from typing import Optional
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+_session: Optional[aiohttp.ClientSession] = None
+
+
+def get_shared_session() -> aiohttp.ClientSession:
+    """Get the process-wide aiohttp session, creating it on first use.
+
+    Must be called from within a running event loop.
+    """
+    global _session
+
+    if _session is None or _session.closed:
+        _session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=100, ttl_dns_cache=300, keepalive_timeout=60),
+        )
+    return _session
+
+
+def create_web_client(token: str):
+    """Create an AsyncWebClient for a bot token backed by the shared session."""
+    from slack_sdk.web.async_client import AsyncWebClient
+    return AsyncWebClient(token=token, session=get_shared_session())
+
+
+async def close_shared_session():
+    """Close the shared session (called on app shutdown)."""
+    global _session
+
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
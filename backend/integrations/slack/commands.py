@@ -1,8 +1,11 @@
 """Slash command handlers for Slack (/lunch, /poll)."""
 
+import asyncio
 import logging
-from slack_bolt import App
+from slack_bolt.async_app import AsyncApp
 
+from lib.firebase import get_poll_doc, update_poll_doc
+from tools.poll import create_poll
 from integrations.slack.session import (
     reset_session,
     save_slack_context,
@@ -11,12 +14,14 @@ from integrations.slack.session import (
 )
 from integrations.slack.messages import build_poll_blocks, agent_response_to_blocks
 from integrations.slack.agent_bridge import invoke_agent_for_slack
+from integrations.slack.background import spawn
+from integrations.slack.rate_limit import slack_call
 from models.integrations import SlackContext
 
 logger = logging.getLogger(__name__)
 
 
-def register_commands(app: App):
+def register_commands(app: AsyncApp):
     """Register all slash command handlers with the Bolt app."""
 
     @app.command("/lunch")
@@ -30,53 +35,64 @@ def register_commands(app: App):
         """
         await ack()
 
-        team_id = command["team_id"]
-        channel_id = command["channel_id"]
-        slack_user_id = command["user_id"]
-        text = command.get("text", "").strip()
-
-        # Create a fresh session for this ordering flow
-        session_id = await reset_session(team_id, channel_id, slack_user_id)
+        async def _work():
+            team_id = command["team_id"]
+            channel_id = command["channel_id"]
+            slack_user_id = command["user_id"]
+            text = command.get("text", "").strip()
 
-        # Build Slack context for response routing
-        context = SlackContext(
-            team_id=team_id,
-            channel_id=channel_id,
-            user_id=slack_user_id,
-            firebase_user_id=await get_linked_firebase_user(slack_user_id),
-        )
-
-        # Load workspace config for finance channel
-        installation = await get_installation(team_id)
-        if installation:
-            context.finance_channel_id = installation.get("financeChannelId")
-
-        await save_slack_context(session_id, context)
+            # Post the initial "working on it" message while the session is set
+            # up; the setup calls below don't block the loop, so they overlap.
+            post_task = asyncio.create_task(slack_call(team_id, client.chat_postMessage(
+                channel=channel_id,
+                text="On it! Starting your lunch order...",
+            )))
+
+            try:
+                # Create a fresh session for this ordering flow, and load the
+                # workspace config for the finance channel
+                session_id, installation = await asyncio.gather(
+                    reset_session(team_id, channel_id, slack_user_id),
+                    get_installation(team_id),
+                )
+                firebase_user_id = await get_linked_firebase_user(slack_user_id)  # Cached by reset_session
+            except BaseException:
+                # Don't leave the post task dangling with an unretrieved result
+                post_task.cancel()
+                await asyncio.gather(post_task, return_exceptions=True)
+                raise
+
+            # Build Slack context for response routing
+            context = SlackContext(
+                team_id=team_id,
+                channel_id=channel_id,
+                user_id=slack_user_id,
+                firebase_user_id=firebase_user_id,
+            )
+            if installation:
+                context.finance_channel_id = installation.get("financeChannelId")
+
+            # Store message_ts for future updates
+            result = await post_task
+            context.message_ts = result["ts"]
+            context.thread_ts = result["ts"]
+            await save_slack_context(session_id, context)
+
+            # Build the user message for the agent
+            if text:
+                user_message = f"Order lunch: {text}"
+            else:
+                user_message = "Order lunch for the team"
+
+            # Invoke the LangGraph agent and post response to Slack
+            await invoke_agent_for_slack(
+                session_id=session_id,
+                user_message=user_message,
+                slack_context=context,
+                client=client,
+            )
 
-        # Post initial "working on it" message
-        result = await client.chat_postMessage(
-            channel=channel_id,
-            text="On it! Starting your lunch order...",
-        )
-
-        # Store message_ts for future updates
-        context.message_ts = result["ts"]
-        context.thread_ts = result["ts"]
-        await save_slack_context(session_id, context)
-
-        # Build the user message for the agent
-        if text:
-            user_message = f"Order lunch: {text}"
-        else:
-            user_message = "Order lunch for the team"
-
-        # Invoke the LangGraph agent and post response to Slack
-        await invoke_agent_for_slack(
-            session_id=session_id,
-            user_message=user_message,
-            slack_context=context,
-            client=client,
-        )
+        spawn(_work(), "/lunch")
 
     @app.command("/poll")
     async def handle_poll(ack, command, say, client):
@@ -88,67 +104,64 @@ def register_commands(app: App):
         await ack()
 
         text = command.get("text", "").strip()
+        team_id = command["team_id"]
         channel_id = command["channel_id"]
 
         if not text or "|" not in text:
-            await client.chat_postMessage(
+            await slack_call(team_id, client.chat_postMessage(
                 channel=channel_id,
                 text="Usage: `/poll Question? | Option 1 | Option 2 | Option 3`",
-            )
+            ))
             return
 
-        parts = [p.strip() for p in text.split("|")]
-        question = parts[0]
-        options = [p for p in parts[1:] if p]
+        question, *options = (p.strip() for p in text.split("|"))
+        options = [o for o in options if o]
 
         if len(options) < 2:
-            await client.chat_postMessage(
+            await slack_call(team_id, client.chat_postMessage(
                 channel=channel_id,
                 text="A poll needs at least 2 options. Separate them with `|`.",
-            )
+            ))
             return
 
         if len(options) > 10:
-            await client.chat_postMessage(
+            await slack_call(team_id, client.chat_postMessage(
                 channel=channel_id,
                 text="Maximum 10 options per poll.",
-            )
+            ))
             return
 
         # Create poll in Firestore using existing poll tool
-        from tools.poll import create_poll
-        poll_result = create_poll.invoke({
+        poll_result = await asyncio.to_thread(create_poll.invoke, {
             "question": question,
             "options": options,
             "deadline_hours": 24,
         })
 
         if "error" in poll_result:
-            await client.chat_postMessage(
+            await slack_call(team_id, client.chat_postMessage(
                 channel=channel_id,
                 text=f"Failed to create poll: {poll_result['error']}",
-            )
+            ))
             return
 
         poll_id = poll_result["poll_id"]
 
         # Build Block Kit poll with interactive buttons
-        from lib.firebase import get_poll_doc
-        poll_data = get_poll_doc(poll_id)
+        poll_data = await asyncio.to_thread(get_poll_doc, poll_id)
 
         blocks = build_poll_blocks(poll_id, question, poll_data["options"])
 
         # Post the poll as an interactive message
-        result = await client.chat_postMessage(
+        result = await slack_call(team_id, client.chat_postMessage(
             channel=channel_id,
             text=question,  # Fallback for notifications
             blocks=blocks,
-        )
+        ))
 
         # Store the message_ts on the poll so we can update it on votes
-        from lib.firebase import update_poll_doc
-        update_poll_doc(poll_id, {
+        await asyncio.to_thread(update_poll_doc, poll_id, {
             "slackChannelId": channel_id,
             "slackMessageTs": result["ts"],
-            "slackTeamId": command["team_id"],
+            "slackTeamId": team_id,
         })
@@ -1,12 +1,56 @@
 """Slack event handlers for @mentions and direct messages."""
 
+import asyncio
 import logging
-from slack_bolt import App
+import re
+from typing import Optional
+from slack_bolt.async_app import AsyncApp
+
+from integrations.slack.session import build_slack_context
+from integrations.slack.agent_bridge import invoke_agent_for_slack
+from integrations.slack.rate_limit import slack_call
 
 logger = logging.getLogger(__name__)
 
+_MENTION_RE = re.compile(r"<@[A-Z0-9]+>\s*")
+
+
+async def _dispatch_to_agent(event: dict, client, text: str, thread_ts: Optional[str] = None):
+    """Resolve the channel's session and hand the message text to the agent."""
+    team_id = event.get("team", "")
+    channel_id = event["channel"]
+    slack_user_id = event["user"]
+
+    # Acknowledge right away so the user sees activity while the agent runs
+    ack_task = asyncio.create_task(_add_ack_reaction(client, team_id, channel_id, event.get("ts")))
+
+    session_id, context = await build_slack_context(
+        team_id, channel_id, slack_user_id, thread_ts=thread_ts, save=True
+    )
+
+    await invoke_agent_for_slack(
+        session_id=session_id,
+        user_message=text,
+        slack_context=context,
+        client=client,
+        thread_ts=thread_ts,
+    )
+    await ack_task
+
+
+async def _add_ack_reaction(client, team_id: str, channel_id: str, message_ts: Optional[str]):
+    """React with :eyes: to the triggering message; failures are only logged."""
+    if not message_ts:
+        return
+    try:
+        await slack_call(team_id, client.reactions_add(
+            channel=channel_id, timestamp=message_ts, name="eyes",
+        ))
+    except Exception as e:
+        logger.warning(f"Could not add ack reaction in {channel_id}: {e}")
 
-def register_events(app: App):
+
+def register_events(app: AsyncApp):
     """Register all event handlers with the Bolt app."""
 
     @app.event("app_mention")
@@ -15,53 +59,20 @@ def register_events(app: App):
 
         Treats the mention text as a chat message to the agent.
         """
-        channel_id = event["channel"]
-        slack_user_id = event["user"]
-        text = event.get("text", "")
-        team_id = event.get("team", "")
         thread_ts = event.get("thread_ts") or event.get("ts")
 
         # Strip the bot mention from the text (e.g., "<@U123ABC> order lunch" → "order lunch")
-        import re
-        text = re.sub(r"<@[A-Z0-9]+>\s*", "", text).strip()
+        text = _MENTION_RE.sub("", event.get("text", "")).strip()
 
         if not text:
-            await client.chat_postMessage(
-                channel=channel_id,
+            await slack_call(event.get("team", ""), client.chat_postMessage(
+                channel=event["channel"],
                 text="How can I help? Try something like: `@edesia order lunch for 10 people tomorrow`",
                 thread_ts=thread_ts,
-            )
+            ))
             return
 
-        from integrations.slack.session import get_or_create_session, save_slack_context, get_linked_firebase_user, get_installation
-        from integrations.slack.agent_bridge import invoke_agent_for_slack
-        from models.integrations import SlackContext
-
-        session_id, firebase_user_id = await get_or_create_session(
-            team_id, channel_id, slack_user_id
-        )
-
-        context = SlackContext(
-            team_id=team_id,
-            channel_id=channel_id,
-            user_id=slack_user_id,
-            firebase_user_id=firebase_user_id,
-            thread_ts=thread_ts,
-        )
-
-        installation = await get_installation(team_id)
-        if installation:
-            context.finance_channel_id = installation.get("financeChannelId")
-
-        await save_slack_context(session_id, context)
-
-        await invoke_agent_for_slack(
-            session_id=session_id,
-            user_message=text,
-            slack_context=context,
-            client=client,
-            thread_ts=thread_ts,
-        )
+        await _dispatch_to_agent(event, client, text, thread_ts=thread_ts)
 
     @app.event("message")
     async def handle_message(event, client):
@@ -78,34 +89,8 @@ def register_events(app: App):
         if event.get("bot_id") or event.get("subtype"):
             return
 
-        channel_id = event["channel"]
-        slack_user_id = event["user"]
         text = event.get("text", "").strip()
-        team_id = event.get("team", "")
-
         if not text:
             return
 
-        from integrations.slack.session import get_or_create_session, save_slack_context, get_linked_firebase_user
-        from integrations.slack.agent_bridge import invoke_agent_for_slack
-        from models.integrations import SlackContext
-
-        session_id, firebase_user_id = await get_or_create_session(
-            team_id, channel_id, slack_user_id
-        )
-
-        context = SlackContext(
-            team_id=team_id,
-            channel_id=channel_id,
-            user_id=slack_user_id,
-            firebase_user_id=firebase_user_id,
-        )
-
-        await save_slack_context(session_id, context)
-
-        await invoke_agent_for_slack(
-            session_id=session_id,
-            user_message=text,
-            slack_context=context,
-            client=client,
-        )
+        await _dispatch_to_agent(event, client, text)
@@ -1,68 +1,93 @@
 """Block Kit message builders for Slack interactive messages."""
 
+from itertools import chain
 from typing import Optional
 from models.orders import VendorOption, FoodOrderContext, OrderItem
 
 
+_DIVIDER = {"type": "divider"}
+
+_VENDOR_OPTIONS_HEADER = {
+    "type": "header",
+    "text": {"type": "plain_text", "text": "Restaurant Options", "emoji": True},
+}
+
+# Fixed sub-dicts of every vendor card, shared by reference across cards
+_SELECT_BUTTON_TEXT = {"type": "plain_text", "text": "Select"}
+
+
 def build_vendor_options_blocks(vendors: list[VendorOption], session_id: str) -> list[dict]:
     """Build Block Kit blocks for vendor selection cards.
 
     Each vendor gets a section with info and a 'Select' button.
     """
-    blocks = [
-        {
-            "type": "header",
-            "text": {"type": "plain_text", "text": "Restaurant Options", "emoji": True},
-        },
-        {"type": "divider"},
+    return [
+        _VENDOR_OPTIONS_HEADER,
+        _DIVIDER,
+        *chain.from_iterable(_vendor_blocks(i, v) for i, v in enumerate(vendors)),
     ]
 
-    for i, vendor in enumerate(vendors):
-        rating = f"{vendor.rating}/5" if vendor.rating else "N/A"
-        price = vendor.price_level or ""
-        categories = ", ".join(vendor.categories[:3]) if vendor.categories else ""
-        distance = f" | {vendor.distance:.1f} mi" if vendor.distance else ""
 
-        text = f"*{i + 1}. {vendor.name}* {price}\n{rating} | {categories}{distance}"
-        if vendor.address:
-            text += f"\n{vendor.address}"
+def _vendor_blocks(i: int, vendor: VendorOption) -> tuple[dict, ...]:
+    """Build the blocks for one vendor card, ending with a divider."""
+    rating = f"{vendor.rating}/5" if vendor.rating else "N/A"
+    price = vendor.price_level or ""
+    categories = ", ".join(vendor.categories[:3]) if vendor.categories else ""
+    distance = f" | {vendor.distance:.1f} mi" if vendor.distance else ""
 
-        section = {
-            "type": "section",
-            "text": {"type": "mrkdwn", "text": text},
-            "accessory": {
-                "type": "button",
-                "text": {"type": "plain_text", "text": "Select"},
-                "action_id": f"vendor_select_{vendor.vendor_id}",
-                "value": vendor.vendor_id,
-            },
-        }
+    text = f"*{i + 1}. {vendor.name}* {price}\n{rating} | {categories}{distance}"
+    if vendor.address:
+        text += f"\n{vendor.address}"
 
-        if vendor.image_url:
-            section["accessory"] = {
-                "type": "image",
-                "image_url": vendor.image_url,
-                "alt_text": vendor.name,
-            }
-            # Move button to an actions block after the section
-            blocks.append(section)
-            blocks.append({
-                "type": "actions",
-                "elements": [
-                    {
-                        "type": "button",
-                        "text": {"type": "plain_text", "text": f"Select {vendor.name}"},
-                        "action_id": f"vendor_select_{vendor.vendor_id}",
-                        "value": vendor.vendor_id,
-                    }
-                ],
-            })
-        else:
-            blocks.append(section)
-
-        blocks.append({"type": "divider"})
+    action_id = f"vendor_select_{vendor.vendor_id}"
 
-    return blocks
+    if not vendor.image_url:
+        accessory = {
+            "type": "button",
+            "text": _SELECT_BUTTON_TEXT,
+            "action_id": action_id,
+            "value": vendor.vendor_id,
+        }
+        return (_vendor_section(text, accessory), _DIVIDER)
+
+    # Image takes the accessory slot; the button moves to an actions block
+    accessory = {"type": "image", "image_url": vendor.image_url, "alt_text": vendor.name}
+    select_button = {
+        "type": "button",
+        "text": {"type": "plain_text", "text": f"Select {vendor.name}"},
+        "action_id": action_id,
+        "value": vendor.vendor_id,
+    }
+    return (
+        _vendor_section(text, accessory),
+        {"type": "actions", "elements": [select_button]},
+        _DIVIDER,
+    )
+
+
+def _vendor_section(text: str, accessory: dict) -> dict:
+    """Build a vendor card's mrkdwn section with its accessory."""
+    return {"type": "section", "text": {"type": "mrkdwn", "text": text}, "accessory": accessory}
+
+
+# Order summary buttons; only "value" (the action ID) varies per message
+_APPROVE_BUTTON = {
+    "type": "button",
+    "text": {"type": "plain_text", "text": "Approve Order"},
+    "style": "primary",
+    "action_id": "order_approve",
+}
+_REJECT_BUTTON = {
+    "type": "button",
+    "text": {"type": "plain_text", "text": "Reject"},
+    "style": "danger",
+    "action_id": "order_reject",
+}
+_MODIFY_BUTTON = {
+    "type": "button",
+    "text": {"type": "plain_text", "text": "Modify"},
+    "action_id": "order_modify",
+}
 
 
 def build_order_summary_blocks(food_order: FoodOrderContext, action_id: str) -> list[dict]:
@@ -74,14 +99,15 @@ def build_order_summary_blocks(food_order: FoodOrderContext, action_id: str) ->
             "type": "header",
             "text": {"type": "plain_text", "text": f"Order from {vendor_name}"},
         },
-        {"type": "divider"},
+        _DIVIDER,
     ]
 
     # Items
     if food_order.menu_items:
-        items_text = ""
-        for item in food_order.menu_items:
-            items_text += f"  {item.quantity}x {item.name} — ${item.price * item.quantity:.2f}\n"
+        items_text = "".join(
+            f"  {item.quantity}x {item.name} — ${item.price * item.quantity:.2f}\n"
+            for item in food_order.menu_items
+        )
         blocks.append({
             "type": "section",
             "text": {"type": "mrkdwn", "text": f"*Items:*\n{items_text}"},
@@ -124,38 +150,36 @@ def build_order_summary_blocks(food_order: FoodOrderContext, action_id: str) ->
             "elements": [{"type": "mrkdwn", "text": " | ".join(delivery_parts)}],
         })
 
-    blocks.append({"type": "divider"})
+    blocks.append(_DIVIDER)
 
     # Approve / Reject buttons
     blocks.append({
         "type": "actions",
         "elements": [
-            {
-                "type": "button",
-                "text": {"type": "plain_text", "text": "Approve Order"},
-                "style": "primary",
-                "action_id": "order_approve",
-                "value": action_id,
-            },
-            {
-                "type": "button",
-                "text": {"type": "plain_text", "text": "Reject"},
-                "style": "danger",
-                "action_id": "order_reject",
-                "value": action_id,
-            },
-            {
-                "type": "button",
-                "text": {"type": "plain_text", "text": "Modify"},
-                "action_id": "order_modify",
-                "value": action_id,
-            },
+            {**_APPROVE_BUTTON, "value": action_id},
+            {**_REJECT_BUTTON, "value": action_id},
+            {**_MODIFY_BUTTON, "value": action_id},
         ],
     })
 
     return blocks
 
 
+def _mrkdwn_section(text: str) -> dict:
+    """Build a single mrkdwn section block."""
+    return {"type": "section", "text": {"type": "mrkdwn", "text": text}}
+
+
+def build_order_approved_blocks(slack_user_id: str, message: str) -> list[dict]:
+    """Build the blocks that replace an order summary once it's approved."""
+    return [_mrkdwn_section(f":white_check_mark: *Order approved* by <@{slack_user_id}>\n{message}")]
+
+
+def build_order_rejected_blocks(slack_user_id: str) -> list[dict]:
+    """Build the blocks that replace an order summary once it's rejected."""
+    return [_mrkdwn_section(f":x: *Order rejected* by <@{slack_user_id}>")]
+
+
 def build_poll_blocks(poll_id: str, question: str, options: list[dict]) -> list[dict]:
     """Build Block Kit blocks for an interactive Slack poll.
 
@@ -166,13 +190,15 @@ def build_poll_blocks(poll_id: str, question: str, options: list[dict]) -> list[
             "type": "header",
             "text": {"type": "plain_text", "text": question},
         },
-        {"type": "divider"},
+        _DIVIDER,
     ]
 
-    # Option buttons
+    # Option buttons, tallying votes in the same pass
+    total_votes = 0
     elements = []
     for opt in options:
         votes = opt.get("votes", 0)
+        total_votes += votes
         label = opt["text"] if votes == 0 else f"{opt['text']} ({votes})"
         elements.append({
             "type": "button",
@@ -182,49 +208,42 @@ def build_poll_blocks(poll_id: str, question: str, options: list[dict]) -> list[
         })
 
     # Slack allows max 25 elements per actions block, split if needed
-    for i in range(0, len(elements), 5):
-        blocks.append({
-            "type": "actions",
-            "elements": elements[i:i + 5],
-        })
+    blocks.extend(
+        {"type": "actions", "elements": elements[i:i + 5]}
+        for i in range(0, len(elements), 5)
+    )
 
     # Vote count context
-    total_votes = sum(opt.get("votes", 0) for opt in options)
+    plural = "" if total_votes == 1 else "s"
     blocks.append({
         "type": "context",
-        "elements": [{"type": "mrkdwn", "text": f"{total_votes} vote{'s' if total_votes != 1 else ''} so far"}],
+        "elements": [{"type": "mrkdwn", "text": f"{total_votes} vote{plural} so far"}],
     })
 
     return blocks
 
 
+# Delivery status -> (emoji, message template)
+_STATUS_FALLBACK = (":bell:", "Order update from *{vendor}*: {status}")
+_STATUS_TABLE: dict[str, tuple[str, str]] = {
+    "created": (":receipt:", "Order from *{vendor}* has been placed."),
+    "confirmed": (":white_check_mark:", "*{vendor}* confirmed your order."),
+    "dasher_confirmed": (":car:", "A driver has been assigned for your *{vendor}* order."),
+    "dasher_confirmed_pickup_arrival": (":round_pushpin:", _STATUS_FALLBACK[1]),
+    "picked_up": (":package:", "Your order from *{vendor}* has been picked up and is on the way!"),
+    "dasher_confirmed_dropoff_arrival": (":house:", _STATUS_FALLBACK[1]),
+    "dropped_off": (":tada:", "Your order from *{vendor}* has been delivered!"),
+    "cancelled": (":x:", "Your order from *{vendor}* has been cancelled."),
+}
+
+
 def build_tracking_update_blocks(status: str, order_data: dict) -> list[dict]:
     """Build Block Kit blocks for delivery tracking status updates."""
     vendor_name = order_data.get("vendor_name", "your restaurant")
     tracking_url = order_data.get("tracking_url", "")
 
-    status_emoji = {
-        "created": ":receipt:",
-        "confirmed": ":white_check_mark:",
-        "dasher_confirmed": ":car:",
-        "dasher_confirmed_pickup_arrival": ":round_pushpin:",
-        "picked_up": ":package:",
-        "dasher_confirmed_dropoff_arrival": ":house:",
-        "dropped_off": ":tada:",
-        "cancelled": ":x:",
-    }
-
-    status_text = {
-        "created": f"Order from *{vendor_name}* has been placed.",
-        "confirmed": f"*{vendor_name}* confirmed your order.",
-        "dasher_confirmed": f"A driver has been assigned for your *{vendor_name}* order.",
-        "picked_up": f"Your order from *{vendor_name}* has been picked up and is on the way!",
-        "dropped_off": f"Your order from *{vendor_name}* has been delivered!",
-        "cancelled": f"Your order from *{vendor_name}* has been cancelled.",
-    }
-
-    emoji = status_emoji.get(status, ":bell:")
-    text = status_text.get(status, f"Order update from *{vendor_name}*: {status}")
+    emoji, template = _STATUS_TABLE.get(status, _STATUS_FALLBACK)
+    text = template.format(vendor=vendor_name, status=status)
 
     blocks = [
         {
@@ -262,17 +281,15 @@ def build_receipt_blocks(order_data: dict) -> list[dict]:
             "type": "header",
             "text": {"type": "plain_text", "text": f"Receipt: {vendor}"},
         },
-        {"type": "divider"},
+        _DIVIDER,
     ]
 
     # Items summary
     if items:
-        items_text = ""
-        for item in items[:15]:  # Cap at 15 items for readability
-            name = item.get("name", "")
-            qty = item.get("quantity", 1)
-            price = item.get("price", 0)
-            items_text += f"  {qty}x {name} — ${price * qty:.2f}\n"
+        items_text = "".join(
+            _receipt_item_line(item)
+            for item in items[:15]  # Cap at 15 items for readability
+        )
         blocks.append({
             "type": "section",
             "text": {"type": "mrkdwn", "text": f"*Items:*\n{items_text}"},
@@ -290,35 +307,37 @@ def build_receipt_blocks(order_data: dict) -> list[dict]:
         ],
     })
 
-    blocks.append({"type": "divider"})
+    blocks.append(_DIVIDER)
 
     return blocks
 
 
+def _receipt_item_line(item: dict) -> str:
+    """Format one receipt line item."""
+    qty = item.get("quantity", 1)
+    return f"  {qty}x {item.get('name', '')} — ${item.get('price', 0) * qty:.2f}\n"
+
+
 def agent_response_to_blocks(text: str) -> list[dict]:
     """Convert a plain-text agent response into Block Kit sections.
 
     Used when the agent responds with markdown text that needs to be
     posted to Slack as Block Kit blocks.
     """
-    # Split long text into 3000-char chunks (Slack section text limit)
+    # Split long text into 3000-char chunks (Slack section text limit),
+    # walking indices so the text is only sliced once per chunk
     chunks = []
-    while text:
-        if len(text) <= 3000:
-            chunks.append(text)
-            break
-        # Find a good break point
-        break_at = text.rfind("\n", 0, 3000)
-        if break_at == -1:
-            break_at = 3000
-        chunks.append(text[:break_at])
-        text = text[break_at:].lstrip("\n")
-
-    blocks = []
-    for chunk in chunks:
-        blocks.append({
-            "type": "section",
-            "text": {"type": "mrkdwn", "text": chunk},
-        })
-
-    return blocks
+    i, n = 0, len(text)
+    while i < n:
+        end = min(i + 3000, n)
+        if end < n:
+            # Find a good break point
+            nl = text.rfind("\n", i, end)
+            if nl > i:
+                end = nl
+        chunks.append(text[i:end])
+        i = end
+        while i < n and text[i] == "\n":
+            i += 1
+
+    return [_mrkdwn_section(chunk) for chunk in chunks]
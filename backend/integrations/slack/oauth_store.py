@@ -3,22 +3,24 @@
 import uuid
 import logging
 from typing import Optional
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 
-from slack_sdk.oauth.installation_store import InstallationStore
+from slack_sdk.oauth.installation_store.async_installation_store import AsyncInstallationStore
 from slack_sdk.oauth.installation_store.models.installation import Installation
-from slack_sdk.oauth.state_store import OAuthStateStore
+from slack_sdk.oauth.state_store.async_state_store import AsyncOAuthStateStore
+from firebase_admin import firestore
 
-logger = logging.getLogger(__name__)
+from lib.firebase import get_async_db
+from integrations.slack.session import invalidate_installation
 
+logger = logging.getLogger(__name__)
 
-class FirestoreInstallationStore(InstallationStore):
-    """Store Slack workspace installations in Firestore."""
 
-    def save(self, installation: Installation) -> None:
-        from lib.firebase import get_db
+class FirestoreInstallationStore(AsyncInstallationStore):
+    """Store Slack workspace installations in Firestore (async client)."""
 
-        db = get_db()
+    async def async_save(self, installation: Installation) -> None:
+        db = get_async_db()
         team_id = installation.team_id or installation.enterprise_id or ""
         if not team_id:
             logger.error("Cannot save installation without team_id or enterprise_id")
@@ -40,10 +42,11 @@ class FirestoreInstallationStore(InstallationStore):
         }
 
         # merge=True preserves existing fields like financeChannelId
-        doc_ref.set(data, merge=True)
+        await doc_ref.set(data, merge=True)
+        invalidate_installation(team_id)
         logger.info(f"Saved Slack installation for team {team_id}")
 
-    def find_installation(
+    async def async_find_installation(
         self,
         *,
         enterprise_id: Optional[str] = None,
@@ -51,14 +54,12 @@ class FirestoreInstallationStore(InstallationStore):
         user_id: Optional[str] = None,
         is_enterprise_install: Optional[bool] = None,
     ) -> Optional[Installation]:
-        from lib.firebase import get_db
-
-        db = get_db()
+        db = get_async_db()
         doc_id = team_id or enterprise_id
         if not doc_id:
             return None
 
-        doc = db.collection("slack_installations").document(doc_id).get()
+        doc = await db.collection("slack_installations").document(doc_id).get()
         if not doc.exists:
             return None
 
@@ -76,58 +77,49 @@ class FirestoreInstallationStore(InstallationStore):
             is_enterprise_install=data.get("isEnterpriseInstall", False),
         )
 
-    def delete_installation(
+    async def async_delete_installation(
         self,
         *,
         enterprise_id: Optional[str] = None,
         team_id: Optional[str] = None,
         user_id: Optional[str] = None,
     ) -> None:
-        from lib.firebase import get_db
-
-        db = get_db()
+        db = get_async_db()
         doc_id = team_id or enterprise_id
         if doc_id:
-            db.collection("slack_installations").document(doc_id).delete()
+            await db.collection("slack_installations").document(doc_id).delete()
+            invalidate_installation(doc_id)
             logger.info(f"Deleted Slack installation for {doc_id}")
 
 
-class FirestoreOAuthStateStore(OAuthStateStore):
+class FirestoreOAuthStateStore(AsyncOAuthStateStore):
     """Store OAuth state tokens in Firestore for CSRF protection."""
 
     def __init__(self, expiration_seconds: int = 600):
         self.expiration_seconds = expiration_seconds
 
-    def issue(self, *args, **kwargs) -> str:
-        from lib.firebase import get_db
-
-        db = get_db()
+    async def async_issue(self, *args, **kwargs) -> str:
+        db = get_async_db()
         state = str(uuid.uuid4())
-        db.collection("slack_oauth_states").document(state).set({
-            "createdAt": datetime.utcnow().isoformat(),
-            "expiresAt": (
-                datetime.utcnow() + timedelta(seconds=self.expiration_seconds)
-            ).isoformat(),
+        # expiresAt is a Timestamp so the Firestore TTL policy can purge stale states
+        await db.collection("slack_oauth_states").document(state).set({
+            "createdAt": firestore.SERVER_TIMESTAMP,
+            "expiresAt": datetime.now(timezone.utc) + timedelta(seconds=self.expiration_seconds),
         })
         return state
 
-    def consume(self, state: str) -> bool:
-        from lib.firebase import get_db
-
-        db = get_db()
+    async def async_consume(self, state: str) -> bool:
+        db = get_async_db()
         doc_ref = db.collection("slack_oauth_states").document(state)
-        doc = doc_ref.get()
+        doc = await doc_ref.get()
 
         if not doc.exists:
             return False
 
-        data = doc.to_dict()
-        expires_at = datetime.fromisoformat(data.get("expiresAt", ""))
+        expires_at = doc.get("expiresAt")
 
         # One-time use — delete immediately
-        doc_ref.delete()
-
-        if datetime.utcnow() > expires_at:
-            return False
+        await doc_ref.delete()
 
-        return True
+        # States issued before expiresAt became a Timestamp are treated as expired
+        return isinstance(expires_at, datetime) and datetime.now(timezone.utc) <= expires_at
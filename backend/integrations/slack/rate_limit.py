@@ -0,0 +1,64 @@
+"""Per-workspace rate limiting for outbound Slack Web API calls.
+
+Slack's chat methods are rate limited per workspace; bursting past the limit
+earns 429s plus client-side retry backoff. Shaping calls locally with a token
+bucket keeps bursts (vote storms, batched approvals) under the limit.
+"""
+
+import time
+import asyncio
+from typing import Any, Awaitable
+
+# Roughly Slack's tier-3 budget: 50 calls per minute per workspace
+CALLS_PER_PERIOD = 50
+PERIOD_SECONDS = 60.0
+
+
+class AsyncTokenBucket:
+    """Token bucket allowing `capacity` acquisitions per `period` seconds."""
+
+    def __init__(self, capacity: int, period: float):
+        self.capacity = capacity
+        self.rate = capacity / period
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        """Wait until a token is available, then take it."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+_buckets: dict[str, AsyncTokenBucket] = {}
+
+
+async def slack_call(team_id: str, call: Awaitable[Any]) -> Any:
+    """Await a Slack Web API call once the workspace's rate budget allows.
+
+    Args:
+        team_id: Slack workspace ID the call is made against.
+        call: The un-awaited client call, e.g. client.chat_postMessage(...).
+
+    Returns:
+        The Slack API response.
+    """
+    bucket = _buckets.get(team_id)
+    if bucket is None:
+        bucket = _buckets.setdefault(team_id, AsyncTokenBucket(CALLS_PER_PERIOD, PERIOD_SECONDS))
+
+    try:
+        await bucket.acquire()
+    except BaseException:
+        call.close()  # Never started; avoid "coroutine was never awaited"
+        raise
+    return await call
@@ -1,21 +1,37 @@
 """Manage Slack <-> LangGraph session mapping via Firestore."""
 
+import asyncio
+import functools
 import uuid
 import logging
 from typing import Optional
 from datetime import datetime
 
-from lib.firebase import get_db
+from lib.firebase import get_async_db, get_db
+from lib.ttl_cache import TTLCache
 from firebase_admin import firestore
 from models.integrations import SlackContext, SlackSession, SlackUserLink
 
 logger = logging.getLogger(__name__)
 
+# (team_id, channel_id) -> (session_id, firebase_user_id). Kept short-lived since
+# another container may reset the channel's session (e.g. a new /lunch).
+_session_cache = TTLCache(maxsize=1000, ttl=60)
+
+# Installations and user links change rarely (install/uninstall, /link)
+_installation_cache = TTLCache(maxsize=1000, ttl=60)
+_user_link_cache = TTLCache(maxsize=5000, ttl=60)
+_MISSING = object()
+
+# team_id -> in-flight installation read, shared by concurrent cache misses
+_installation_lookups: dict[str, asyncio.Future] = {}
+
 
 async def get_or_create_session(
     team_id: str,
     channel_id: str,
     slack_user_id: str,
+    context: Optional[SlackContext] = None,
 ) -> tuple[str, Optional[str]]:
     """Get an existing LangGraph session for a Slack channel, or create one.
 
@@ -23,6 +39,8 @@ async def get_or_create_session(
         team_id: Slack workspace ID.
         channel_id: Slack channel/DM ID.
         slack_user_id: Slack user who triggered the interaction.
+        context: Optional Slack context to persist in the same write
+            (its firebase_user_id is filled in from the session).
 
     Returns:
         Tuple of (session_id, firebase_user_id or None).
@@ -34,15 +52,19 @@ async def get_or_create_session(
     doc = session_ref.get()
     if doc.exists:
         data = doc.to_dict()
-        # Update last_active
-        session_ref.update({"lastActive": firestore.SERVER_TIMESTAMP})
+        # Update last_active (and the Slack context, if given)
+        updates = {"lastActive": firestore.SERVER_TIMESTAMP}
+        if context is not None:
+            context.firebase_user_id = data.get("firebaseUserId")
+            updates["slackContext"] = context.model_dump_json()
+        session_ref.update(updates)
         return data["sessionId"], data.get("firebaseUserId")
 
-    # Create new session
+    # Create new session; the user link is only needed here
     session_id = str(uuid.uuid4())
     firebase_user_id = await get_linked_firebase_user(slack_user_id)
 
-    session_ref.set({
+    session_data = {
         "teamId": team_id,
         "channelId": channel_id,
         "sessionId": session_id,
@@ -50,11 +72,58 @@ async def get_or_create_session(
         "firebaseUserId": firebase_user_id,
         "createdAt": firestore.SERVER_TIMESTAMP,
         "lastActive": firestore.SERVER_TIMESTAMP,
-    })
+    }
+    if context is not None:
+        context.firebase_user_id = firebase_user_id
+        session_data["slackContext"] = context.model_dump_json()
+    _write_new_session(db, session_ref, session_id, session_data)
 
     return session_id, firebase_user_id
 
 
+async def build_slack_context(
+    team_id: str,
+    channel_id: str,
+    slack_user_id: str,
+    thread_ts: Optional[str] = None,
+    save: bool = False,
+) -> tuple[str, SlackContext]:
+    """Resolve the channel's session and build the SlackContext for a handler.
+
+    The session lookup is cached briefly per channel, so repeated clicks and
+    messages in an active channel skip the Firestore round-trips.
+
+    Args:
+        save: Also persist the context for webhook routing. On a cache miss
+            this rides along with the session upsert instead of a separate write.
+
+    Returns:
+        Tuple of (session_id, SlackContext).
+    """
+    # Fields come straight from the Slack payload, so skip validation
+    context = SlackContext.model_construct(
+        team_id=team_id,
+        channel_id=channel_id,
+        user_id=slack_user_id,
+        thread_ts=thread_ts,
+    )
+
+    key = (team_id, channel_id)
+    cached = _session_cache.get(key)
+    if cached is None:
+        cached = await get_or_create_session(
+            team_id, channel_id, slack_user_id, context=context if save else None
+        )
+        _session_cache.set(key, cached)
+        session_id, context.firebase_user_id = cached
+    else:
+        session_id, context.firebase_user_id = cached
+        if save:
+            await save_slack_context(session_id, context)
+
+    return session_id, context
+
+
 async def reset_session(team_id: str, channel_id: str, slack_user_id: str) -> str:
     """Create a fresh session for a Slack channel (e.g., new /lunch command).
 
@@ -68,7 +137,8 @@ async def reset_session(team_id: str, channel_id: str, slack_user_id: str) -> st
     session_id = str(uuid.uuid4())
     firebase_user_id = await get_linked_firebase_user(slack_user_id)
 
-    session_ref.set({
+    # Sync batch commit; keep it off the event loop
+    await asyncio.to_thread(_write_new_session, db, session_ref, session_id, {
         "teamId": team_id,
         "channelId": channel_id,
         "sessionId": session_id,
@@ -77,20 +147,37 @@ async def reset_session(team_id: str, channel_id: str, slack_user_id: str) -> st
         "createdAt": firestore.SERVER_TIMESTAMP,
         "lastActive": firestore.SERVER_TIMESTAMP,
     })
+    _session_cache.set((team_id, channel_id), (session_id, firebase_user_id))
 
     return session_id
 
 
+def _write_new_session(db, session_ref, session_id: str, session_data: dict):
+    """Write a new channel session plus its session_id -> doc index entry.
+
+    The index lets webhooks find the session by ID with a direct get instead
+    of a query. Entries for replaced sessions are left behind; readers check
+    that the channel doc still holds the same sessionId.
+    """
+    batch = db.batch()
+    batch.set(session_ref, session_data)
+    batch.set(
+        db.collection("slack_session_index").document(session_id),
+        {"docId": session_ref.id},
+    )
+    batch.commit()
+
+
 async def save_slack_context(session_id: str, context: SlackContext):
     """Persist Slack context for response routing.
 
-    Stored alongside the session so webhooks (DoorDash, Stripe)
-    can route updates back to the correct Slack channel.
+    Stored alongside the session, as a JSON string, so webhooks
+    (DoorDash, Stripe) can route updates back to the correct Slack channel.
     """
     db = get_db()
     doc_id = f"{context.team_id}_{context.channel_id}"
     db.collection("slack_sessions").document(doc_id).update({
-        "slackContext": context.model_dump(),
+        "slackContext": context.model_dump_json(),
     })
 
 
@@ -100,14 +187,23 @@ async def get_slack_context_for_session(session_id: str) -> Optional[SlackContex
     Used by webhooks to find the right Slack channel for status updates.
     """
     db = get_db()
-    docs = db.collection("slack_sessions") \
-             .where("sessionId", "==", session_id) \
-             .limit(1).stream()
+    index_doc = db.collection("slack_session_index").document(session_id).get()
+    if index_doc.exists:
+        doc = db.collection("slack_sessions").document(index_doc.get("docId")).get()
+        docs = [doc] if doc.exists and doc.get("sessionId") == session_id else []
+    else:
+        # Sessions created before the index existed
+        docs = db.collection("slack_sessions") \
+                 .where("sessionId", "==", session_id) \
+                 .limit(1).stream()
 
     for doc in docs:
         data = doc.to_dict()
         ctx = data.get("slackContext")
+        if isinstance(ctx, str):
+            return SlackContext.model_validate_json(ctx)
         if ctx:
+            # Stored as a map before contexts were saved as JSON
             return SlackContext(**ctx)
 
     return None
@@ -134,26 +230,63 @@ async def link_slack_user(slack_user_id: str, firebase_user_id: str, team_id: st
         "teamId": team_id,
         "linkedAt": firestore.SERVER_TIMESTAMP,
     })
+    _user_link_cache.pop(slack_user_id)
 
 
 async def get_linked_firebase_user(slack_user_id: str) -> Optional[str]:
     """Get the Firebase user ID linked to a Slack user."""
-    db = get_db()
-    doc = db.collection("slack_user_links").document(slack_user_id).get()
-    if doc.exists:
-        return doc.to_dict().get("firebaseUserId")
-    return None
+    firebase_user_id = _user_link_cache.get(slack_user_id, _MISSING)
+    if firebase_user_id is not _MISSING:
+        return firebase_user_id
+
+    db = get_async_db()
+    doc = await db.collection("slack_user_links").document(slack_user_id).get()
+    firebase_user_id = doc.to_dict().get("firebaseUserId") if doc.exists else None
+    _user_link_cache.set(slack_user_id, firebase_user_id)
+    return firebase_user_id
 
 
 # ==================== Installation ====================
 
 async def get_installation(team_id: str) -> Optional[dict]:
-    """Get Slack workspace installation config."""
-    db = get_db()
-    doc = db.collection("slack_installations").document(team_id).get()
-    if doc.exists:
-        return doc.to_dict()
-    return None
+    """Get Slack workspace installation config.
+
+    Concurrent cache misses for the same workspace (e.g. a burst of order
+    notifications) share a single Firestore read.
+    """
+    installation = _installation_cache.get(team_id, _MISSING)
+    if installation is not _MISSING:
+        return installation
+
+    lookup = _installation_lookups.get(team_id)
+    if lookup is None:
+        lookup = asyncio.ensure_future(_fetch_installation(team_id))
+        _installation_lookups[team_id] = lookup
+        lookup.add_done_callback(functools.partial(_finish_installation_lookup, team_id))
+    # Shielded so one caller being cancelled doesn't fail the others
+    return await asyncio.shield(lookup)
+
+
+async def _fetch_installation(team_id: str) -> Optional[dict]:
+    """Read a workspace installation from Firestore."""
+    db = get_async_db()
+    doc = await db.collection("slack_installations").document(team_id).get()
+    return doc.to_dict() if doc.exists else None
+
+
+def _finish_installation_lookup(team_id: str, lookup: asyncio.Future):
+    """Cache a finished lookup, unless the installation changed meanwhile."""
+    if _installation_lookups.get(team_id) is not lookup:
+        return
+    del _installation_lookups[team_id]
+    if not lookup.cancelled() and lookup.exception() is None:
+        _installation_cache.set(team_id, lookup.result())
+
+
+def invalidate_installation(team_id: str):
+    """Drop a workspace's cached installation after it changes."""
+    _installation_cache.pop(team_id)
+    _installation_lookups.pop(team_id, None)
 
 
 async def save_installation(team_id: str, data: dict):
@@ -161,3 +294,4 @@ async def save_installation(team_id: str, data: dict):
     db = get_db()
     data["createdAt"] = firestore.SERVER_TIMESTAMP
     db.collection("slack_installations").document(team_id).set(data, merge=True)
+    invalidate_installation(team_id)
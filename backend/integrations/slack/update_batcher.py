@@ -0,0 +1,77 @@
+"""Coalesce bursts of chat_update calls for the same Slack message.
+
+Popular polls can receive many votes per second; posting every intermediate
+state wastes Slack rate limit on updates nobody sees. Updates are held for a
+short window per (channel, message_ts) and only the latest one is sent.
+
+The blocks are built at flush time rather than when the update is queued:
+concurrent vote tasks can finish out of order, so whatever state a task saw
+may already be older than what a sibling task saw.
+"""
+
+import asyncio
+import logging
+from typing import Awaitable, Callable
+
+from integrations.slack.rate_limit import slack_call
+
+logger = logging.getLogger(__name__)
+
+# How long to wait for further updates before flushing to Slack (seconds)
+FLUSH_DELAY_SECONDS = 0.2
+
+# (channel_id, message_ts) -> latest (client, team_id, text, blocks_factory)
+_pending: dict[tuple[str, str], tuple] = {}
+# Flush tasks, kept referenced so they aren't garbage-collected mid-sleep
+_flush_tasks: dict[tuple[str, str], asyncio.Task] = {}
+
+
+async def schedule_update(
+    client,
+    team_id: str,
+    channel_id: str,
+    message_ts: str,
+    text: str,
+    blocks_factory: Callable[[], Awaitable[list[dict]]],
+) -> None:
+    """Queue a chat_update, replacing any update still waiting for this message.
+
+    Args:
+        client: Slack AsyncWebClient used for the eventual update.
+        team_id: Workspace ID (for rate limiting).
+        channel_id: Channel containing the message.
+        message_ts: Timestamp of the message to update.
+        text: Fallback text for the update.
+        blocks_factory: Async callable that builds the Block Kit blocks from
+            current state; only called for the update that is actually sent.
+    """
+    key = (channel_id, message_ts)
+    _pending[key] = (client, team_id, text, blocks_factory)
+
+    if key not in _flush_tasks:
+        _flush_tasks[key] = asyncio.create_task(_flush_after_delay(key))
+
+
+async def _flush_after_delay(key: tuple[str, str]) -> None:
+    """Wait out the coalescing window, then send the latest queued update."""
+    try:
+        await asyncio.sleep(FLUSH_DELAY_SECONDS)
+    finally:
+        _flush_tasks.pop(key, None)
+
+    pending = _pending.pop(key, None)
+    if pending is None:
+        return
+
+    client, team_id, text, blocks_factory = pending
+    channel_id, message_ts = key
+    try:
+        blocks = await blocks_factory()
+        await slack_call(team_id, client.chat_update(
+            channel=channel_id,
+            ts=message_ts,
+            text=text,
+            blocks=blocks,
+        ))
+    except Exception as e:
+        logger.error(f"Coalesced chat_update failed for {channel_id}/{message_ts}: {e}")
@@ -5,6 +5,8 @@ registering the inbound assistant. The LLM (Groq) handles the conversation;
 our backend only exposes stateless tool endpoints.
 """
 
+import functools
+
 INBOUND_SYSTEM_PROMPT = """\
 You are Edesia, a friendly AI food-planning assistant on a phone call.
 
@@ -30,6 +32,7 @@ CAPABILITIES:
 
 # Server URL placeholder — replaced at registration time by build_inbound_config()
 _SERVER_URL_PLACEHOLDER = "{{SERVER_URL}}"
+_PLACEHOLDER_SERVER = {"url": _SERVER_URL_PLACEHOLDER}  # shared by every tool
 
 TOOL_DEFINITIONS = [
     {
@@ -60,7 +63,7 @@ TOOL_DEFINITIONS = [
                 "required": ["location"],
             },
         },
-        "server": {"url": _SERVER_URL_PLACEHOLDER},
+        "server": _PLACEHOLDER_SERVER,
     },
     {
         "type": "function",
@@ -90,7 +93,7 @@ TOOL_DEFINITIONS = [
                 "required": ["location"],
             },
         },
-        "server": {"url": _SERVER_URL_PLACEHOLDER},
+        "server": _PLACEHOLDER_SERVER,
     },
     {
         "type": "function",
@@ -108,7 +111,7 @@ TOOL_DEFINITIONS = [
                 "required": ["place_id"],
             },
         },
-        "server": {"url": _SERVER_URL_PLACEHOLDER},
+        "server": _PLACEHOLDER_SERVER,
     },
     {
         "type": "function",
@@ -126,7 +129,7 @@ TOOL_DEFINITIONS = [
                 "required": ["caterer_id"],
             },
         },
-        "server": {"url": _SERVER_URL_PLACEHOLDER},
+        "server": _PLACEHOLDER_SERVER,
     },
     {
         "type": "function",
@@ -172,7 +175,7 @@ TOOL_DEFINITIONS = [
                 "required": ["restaurant_id", "party_size", "date", "time", "contact_name", "contact_email"],
             },
         },
-        "server": {"url": _SERVER_URL_PLACEHOLDER},
+        "server": _PLACEHOLDER_SERVER,
     },
     {
         "type": "function",
@@ -219,7 +222,7 @@ TOOL_DEFINITIONS = [
                 "required": ["caterer_id", "headcount"],
             },
         },
-        "server": {"url": _SERVER_URL_PLACEHOLDER},
+        "server": _PLACEHOLDER_SERVER,
     },
     {
         "type": "function",
@@ -237,7 +240,7 @@ TOOL_DEFINITIONS = [
                 "required": ["email"],
             },
         },
-        "server": {"url": _SERVER_URL_PLACEHOLDER},
+        "server": _PLACEHOLDER_SERVER,
     },
     {
         "type": "function",
@@ -259,7 +262,7 @@ TOOL_DEFINITIONS = [
                 "required": ["name"],
             },
         },
-        "server": {"url": _SERVER_URL_PLACEHOLDER},
+        "server": _PLACEHOLDER_SERVER,
     },
 ]
 
@@ -308,18 +311,22 @@ INBOUND_ASSISTANT_CONFIG = {
 }
 
 
+@functools.lru_cache(maxsize=8)
 def build_inbound_config(server_url: str) -> dict:
     """Return a copy of INBOUND_ASSISTANT_CONFIG with server URLs filled in.
 
+    Only the tool ``server`` entries differ per URL, so just the path down to
+    them is rebuilt; every other subtree is shared with INBOUND_ASSISTANT_CONFIG.
+    The result is also memoized per URL, so treat it as read-only.
+
     Args:
         server_url: The base URL for tool-call webhooks,
                     e.g. "https://edesia-agent--fastapi-app.modal.run/webhooks/vapi/tool-calls"
     """
-    import copy
-    config = copy.deepcopy(INBOUND_ASSISTANT_CONFIG)
-
-    for tool_def in config["model"]["tools"]:
-        if "server" in tool_def:
-            tool_def["server"]["url"] = server_url
-
-    return config
+    model = INBOUND_ASSISTANT_CONFIG["model"]
+    server = {"url": server_url}
+    tools = [
+        {**tool_def, "server": server} if "server" in tool_def else tool_def
+        for tool_def in model["tools"]
+    ]
+    return {**INBOUND_ASSISTANT_CONFIG, "model": {**model, "tools": tools}}
@@ -5,86 +5,152 @@ and returns a JSON string that VAPI feeds back to the assistant LLM.
 """
 
 import asyncio
-import json
+import functools
 from typing import Callable, Awaitable
 
+import orjson
+
+from lib.firebase import find_inbound_calls_by_email
+from lib.ttl_cache import TTLCache
+from tools.catering import get_catering_menu, request_catering_quote, search_caterers
+from tools.google_places import get_place_details
+from tools.opentable import make_reservation
+from tools.yelp_search import yelp_search_restaurants
+
 
 # ---------------------------------------------------------------------------
 # Voice-output helpers
 # ---------------------------------------------------------------------------
 
 # Fields that are useless over voice (image URLs, map links, etc.)
-_STRIP_KEYS = {
+_STRIP_KEYS = frozenset({
     "image_url", "url", "photos", "google_maps_url", "photo_reference",
     "location", "geometry", "place_id", "id",
-}
+})
 
 
 def _trim_for_voice(obj, max_items: int = 5):
-    """Strip visual-only fields and cap list lengths for voice delivery."""
-    if isinstance(obj, dict):
-        return {
-            k: _trim_for_voice(v, max_items)
-            for k, v in obj.items()
-            if k not in _STRIP_KEYS
-        }
-    if isinstance(obj, list):
-        return [_trim_for_voice(item, max_items) for item in obj[:max_items]]
-    return obj
-
-
-async def _invoke_tool(tool_fn, params: dict) -> str:
-    """Invoke a LangChain @tool (sync or async) and return trimmed JSON."""
-    if asyncio.iscoroutinefunction(tool_fn.func if hasattr(tool_fn, "func") else tool_fn):
-        result = await tool_fn.ainvoke(params)
-    else:
-        result = await asyncio.to_thread(tool_fn.invoke, params)
+    """Strip visual-only fields and cap list lengths for voice delivery.
+
+    Walks the result with an explicit stack instead of recursing. Builds a
+    trimmed copy rather than editing in place, since some tools return their
+    module-level mock data directly.
+    """
+    if not isinstance(obj, (dict, list)):
+        return obj
+
+    strip = _STRIP_KEYS  # local alias for the inner loop
+    root = {} if isinstance(obj, dict) else []
+    stack = [(obj, root)]
+    while stack:
+        src, dst = stack.pop()
+        if isinstance(src, dict):
+            for k, v in src.items():
+                if k in strip:
+                    continue
+                if isinstance(v, (dict, list)):
+                    child = {} if isinstance(v, dict) else []
+                    stack.append((v, child))
+                    v = child
+                dst[k] = v
+        else:
+            for v in src[:max_items]:
+                if isinstance(v, (dict, list)):
+                    child = {} if isinstance(v, dict) else []
+                    stack.append((v, child))
+                    v = child
+                dst.append(v)
+    return root
+
+
+def _to_json(obj) -> str:
+    """Serialize a tool result to the JSON string VAPI expects."""
+    return orjson.dumps(obj, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
+# id(tool) -> coroutine function taking the params dict. Keyed by id since
+# LangChain tools (pydantic models) aren't hashable; the tools are module-level
+# singletons, so their ids are stable.
+_INVOKERS: dict[int, Callable[[dict], Awaitable]] = {}
+
+
+def _get_invoker(tool_fn) -> Callable[[dict], Awaitable]:
+    """Resolve (once per tool) how to await a LangChain @tool, sync or async."""
+    invoker = _INVOKERS.get(id(tool_fn))
+    if invoker is None:
+        if asyncio.iscoroutinefunction(getattr(tool_fn, "func", tool_fn)):
+            invoker = tool_fn.ainvoke
+        else:
+            invoker = functools.partial(asyncio.to_thread, tool_fn.invoke)
+        _INVOKERS[id(tool_fn)] = invoker
+    return invoker
+
+
+# (tool name, canonical params) -> serialized result, for read-only lookups
+# that callers tend to repeat within a call ("what were those options again?")
+_RESULT_CACHE = TTLCache(maxsize=512, ttl=120)
+
+
+async def _invoke_tool(tool_fn, params: dict, cache: bool = False) -> str:
+    """Invoke a LangChain @tool (sync or async) and return trimmed JSON.
+
+    Args:
+        tool_fn: The LangChain tool to run.
+        params: Tool arguments.
+        cache: Reuse a recent result for identical params. Only for read-only
+            tools; never for ones that book or request anything.
+    """
+    if cache:
+        key = (tool_fn.name, orjson.dumps(params, option=orjson.OPT_SORT_KEYS))
+        cached = _RESULT_CACHE.get(key)
+        if cached is not None:
+            return cached
+
+    result = await _get_invoker(tool_fn)(params)
     trimmed = _trim_for_voice(result)
-    return json.dumps(trimmed, default=str)
+    output = _to_json(trimmed)
+
+    if cache:
+        _RESULT_CACHE.set(key, output)
+    return output
 
 
 # ---------------------------------------------------------------------------
 # Tool handlers
 # ---------------------------------------------------------------------------
 
-async def handle_search_restaurants(params: dict, **_kw) -> str:
-    from tools.yelp_search import yelp_search_restaurants
-    return await _invoke_tool(yelp_search_restaurants, {
+# Each LangChain-backed tool only differs in how VAPI's params are reshaped
+# into the tool's arguments, so those handlers are generated from a table.
+
+def _search_restaurants_args(params: dict) -> dict:
+    return {
         "location": params.get("location", ""),
         "term": params.get("term"),
         "cuisine": params.get("cuisine"),
         "price": params.get("price"),
         "limit": params.get("limit", 5),
-    })
+    }
 
 
-async def handle_search_caterers(params: dict, **_kw) -> str:
-    from tools.catering import search_caterers
-    return await _invoke_tool(search_caterers, {
+def _search_caterers_args(params: dict) -> dict:
+    return {
         "location": params.get("location", ""),
         "headcount": params.get("headcount"),
         "cuisine": params.get("cuisine"),
         "max_price_per_person": params.get("max_price_per_person"),
-    })
+    }
 
 
-async def handle_get_restaurant_details(params: dict, **_kw) -> str:
-    from tools.google_places import get_place_details
-    return await _invoke_tool(get_place_details, {
-        "place_id": params.get("place_id", ""),
-    })
+def _restaurant_details_args(params: dict) -> dict:
+    return {"place_id": params.get("place_id", "")}
 
 
-async def handle_get_catering_menu(params: dict, **_kw) -> str:
-    from tools.catering import get_catering_menu
-    return await _invoke_tool(get_catering_menu, {
-        "caterer_id": params.get("caterer_id", ""),
-    })
+def _catering_menu_args(params: dict) -> dict:
+    return {"caterer_id": params.get("caterer_id", "")}
 
 
-async def handle_make_reservation(params: dict, **_kw) -> str:
-    from tools.opentable import make_reservation
-    return await _invoke_tool(make_reservation, {
+def _make_reservation_args(params: dict) -> dict:
+    return {
         "restaurant_id": params.get("restaurant_id", ""),
         "party_size": params.get("party_size", 2),
         "date": params.get("date", ""),
@@ -93,12 +159,11 @@ async def handle_make_reservation(params: dict, **_kw) -> str:
         "contact_email": params.get("contact_email", ""),
         "contact_phone": params.get("contact_phone"),
         "special_requests": params.get("special_requests"),
-    })
+    }
 
 
-async def handle_request_catering_quote(params: dict, **_kw) -> str:
-    from tools.catering import request_catering_quote
-    return await _invoke_tool(request_catering_quote, {
+def _catering_quote_args(params: dict) -> dict:
+    return {
         "caterer_id": params.get("caterer_id", ""),
         "headcount": params.get("headcount", 10),
         "package_name": params.get("package_name"),
@@ -107,47 +172,71 @@ async def handle_request_catering_quote(params: dict, **_kw) -> str:
         "delivery_time": params.get("delivery_time"),
         "delivery_address": params.get("delivery_address"),
         "dietary_notes": params.get("dietary_notes"),
-    })
+    }
+
+
+# name -> (LangChain tool, params projection, cache results). Only read-only
+# lookups are cacheable.
+_LANGCHAIN_TOOLS = {
+    "search_restaurants": (yelp_search_restaurants, _search_restaurants_args, True),
+    "search_caterers": (search_caterers, _search_caterers_args, True),
+    "get_restaurant_details": (get_place_details, _restaurant_details_args, True),
+    "get_catering_menu": (get_catering_menu, _catering_menu_args, True),
+    "make_reservation": (make_reservation, _make_reservation_args, False),
+    "request_catering_quote": (request_catering_quote, _catering_quote_args, False),
+}
+
+
+async def _handle_langchain_tool(tool_fn, to_args, cache: bool, params: dict, **_kw) -> str:
+    """Generic handler: reshape params and run the LangChain tool."""
+    return await _invoke_tool(tool_fn, to_args(params), cache=cache)
+
+
+# Fixed responses, serialized once
+_EMAIL_REQUIRED_RESPONSE = _to_json({"error": "Email is required to look up orders."})
+_NO_ORDERS_RESPONSE = _to_json({"message": "No previous orders found for that email."})
 
 
 async def handle_check_order_status(params: dict, **_kw) -> str:
     """Look up existing inbound call records by caller email."""
-    from lib.firebase import find_inbound_calls_by_email
-
     email = params.get("email", "")
     if not email:
-        return json.dumps({"error": "Email is required to look up orders."})
+        return _EMAIL_REQUIRED_RESPONSE
 
     calls = await find_inbound_calls_by_email(email)
     if not calls:
-        return json.dumps({"message": "No previous orders found for that email."})
+        return _NO_ORDERS_RESPONSE
 
-    # Return a concise summary of recent calls
-    summaries = []
-    for c in calls[:5]:
-        summaries.append({
+    # Return a concise summary of recent calls. Already voice-sized (flat,
+    # at most 5, no strip keys), so it skips _trim_for_voice.
+    summaries = [
+        {
             "date": c.get("createdAt"),
             "intent": c.get("intent", "unknown"),
             "summary": c.get("summary", ""),
             "status": c.get("status", "unknown"),
-        })
-    return json.dumps(_trim_for_voice(summaries), default=str)
+        }
+        for c in calls[:5]
+    ]
+    return _to_json(summaries)
 
 
 async def handle_collect_caller_info(params: dict, call_id: str = "", calls_dict=None, **_kw) -> str:
-    """Save caller name and email to the in-memory call record."""
+    """Save caller name and email to the call record in calls_dict."""
     name = params.get("name", "")
     email = params.get("email", "")
 
-    if calls_dict is not None and call_id:
-        call_data = calls_dict.get(call_id, {})
+    # calls_dict is a Modal Dict: values come back as copies, so merge and
+    # write back, and skip both round-trips when there's nothing to save
+    if calls_dict is not None and call_id and (name or email):
+        call_data = await calls_dict.get.aio(call_id, {})
         if name:
             call_data["caller_name"] = name
         if email:
             call_data["caller_email"] = email
-        calls_dict[call_id] = call_data
+        await calls_dict.put.aio(call_id, call_data)
 
-    return json.dumps({
+    return _to_json({
         "message": "Got it, thanks!",
         "name": name,
         "email": email,
@@ -159,12 +248,36 @@ async def handle_collect_caller_info(params: dict, call_id: str = "", calls_dict
 # ---------------------------------------------------------------------------
 
 INBOUND_TOOL_HANDLERS: dict[str, Callable[..., Awaitable[str]]] = {
-    "search_restaurants": handle_search_restaurants,
-    "search_caterers": handle_search_caterers,
-    "get_restaurant_details": handle_get_restaurant_details,
-    "get_catering_menu": handle_get_catering_menu,
-    "make_reservation": handle_make_reservation,
-    "request_catering_quote": handle_request_catering_quote,
+    **{
+        name: functools.partial(_handle_langchain_tool, *spec)
+        for name, spec in _LANGCHAIN_TOOLS.items()
+    },
     "check_order_status": handle_check_order_status,
     "collect_caller_info": handle_collect_caller_info,
 }
+
+
+async def dispatch_many(tool_calls: list[tuple[str, dict]], **kwargs) -> list[str]:
+    """Run one turn's tool calls concurrently, returning results in order.
+
+    A failing or unknown tool yields an error payload for that call only.
+
+    Args:
+        tool_calls: (tool name, params) pairs from the VAPI tool-calls message.
+        **kwargs: Passed to every handler (call_id, calls_dict).
+    """
+    return await asyncio.gather(*(
+        _dispatch_one(name, params, **kwargs) for name, params in tool_calls
+    ))
+
+
+async def _dispatch_one(name: str, params: dict, **kwargs) -> str:
+    """Run a single tool call, turning failures into an error payload."""
+    handler = INBOUND_TOOL_HANDLERS.get(name)
+    if handler is None:
+        return _to_json({"error": f"Unknown tool: {name}"})
+    try:
+        return await handler(params, **kwargs)
+    except Exception as e:
+        print(f"[VAPI-INBOUND] Tool {name} error: {e}")
+        return _to_json({"error": f"Tool error: {e}"})
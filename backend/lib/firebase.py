@@ -1,24 +1,37 @@
 """Firebase Admin SDK helper for backend operations."""
 
+import asyncio
 import os
 import json
+import logging
 from typing import Optional
-from datetime import datetime
+from time import time_ns
 
 import firebase_admin
 from firebase_admin import credentials, firestore
+from google.cloud.firestore import AsyncClient
+
+from lib.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
 
 _db = None
+_async_dbs: dict = {}  # event loop -> AsyncClient (one client per loop)
 
+# Caller email -> recent inbound calls. The assistant often re-checks the same
+# email within one phone call.
+_inbound_calls_cache = TTLCache(maxsize=1024, ttl=60)
 
-def get_db():
-    """Get Firestore database client, initializing if needed."""
-    global _db
+# Read-mostly docs fetched several times per chat turn or page view. Writes
+# from this process invalidate; the TTL bounds staleness from other writers
+# (other containers, the frontend editing users/{uid} directly).
+_user_prefs_cache = TTLCache(maxsize=1024, ttl=30)
+_poll_cache = TTLCache(maxsize=1024, ttl=30)
+_form_cache = TTLCache(maxsize=1024, ttl=30)
 
-    if _db is not None:
-        return _db
 
-    # Initialize Firebase Admin if not already done
+def _init_app():
+    """Initialize the Firebase Admin app if not already done."""
     if not firebase_admin._apps:
         service_account_json = os.getenv("FIREBASE_SERVICE_ACCOUNT")
         if service_account_json:
@@ -27,46 +40,96 @@ def get_db():
         else:
             raise ValueError("FIREBASE_SERVICE_ACCOUNT environment variable not set")
 
+
+def get_db():
+    """Get Firestore database client, initializing if needed."""
+    global _db
+
+    if _db is not None:
+        return _db
+
+    _init_app()
     _db = firestore.client()
     return _db
 
 
+def get_async_db():
+    """Get an async Firestore client for the running event loop.
+
+    Clients hold a gRPC channel bound to the loop that created them, so one is
+    kept per loop: sync tools that drive these helpers in a private loop get
+    their own client instead of sharing the server loop's.
+
+    The map is a plain dict: a client's channel references its loop, so weak
+    keys would never be released anyway. Clients of loops that have since
+    closed are dropped here instead (their channel can't be closed without a
+    running loop, so they are just released for collection).
+    """
+    loop = asyncio.get_running_loop()
+    for stale in [other for other in _async_dbs if other.is_closed()]:
+        del _async_dbs[stale]
+    db = _async_dbs.get(loop)
+    if db is None:
+        _init_app()
+        app = firebase_admin.get_app()
+        db = AsyncClient(project=app.project_id, credentials=app.credential.get_credential())
+        _async_dbs[loop] = db
+    return db
+
+
 # ==================== CALL LOGS ====================
 
 async def add_call_log(chat_id: str, order_id: str, call_data: dict) -> str:
     """Add a call log to an order."""
-    db = get_db()
+    db = get_async_db()
 
     call_ref = db.collection("chats").document(chat_id) \
                  .collection("orders").document(order_id) \
                  .collection("calls").document()
 
     call_data["createdAt"] = firestore.SERVER_TIMESTAMP
-    call_ref.set(call_data)
+    batch = db.batch()
+    batch.set(call_ref, call_data)
+    if call_data.get("vapiCallId"):
+        batch.set(
+            db.collection("vapi_call_index").document(call_data["vapiCallId"]),
+            {"path": call_ref.path},
+        )
+    await batch.commit()
 
     return call_ref.id
 
 
 async def update_call_log(chat_id: str, order_id: str, call_id: str, updates: dict):
     """Update a call log."""
-    db = get_db()
+    db = get_async_db()
 
     call_ref = db.collection("chats").document(chat_id) \
                  .collection("orders").document(order_id) \
                  .collection("calls").document(call_id)
 
-    call_ref.update(updates)
+    await call_ref.update(updates)
 
 
 async def find_call_by_vapi_id(vapi_call_id: str) -> Optional[dict]:
     """Find a call log by Vapi call ID."""
-    db = get_db()
+    db = get_async_db()
+
+    index_doc = await db.collection("vapi_call_index").document(vapi_call_id).get()
+    if index_doc.exists:
+        call = await db.document(index_doc.get("path")).get()
+        if call.exists:
+            return {
+                "id": call.id,
+                "path": call.reference.path,
+                **call.to_dict()
+            }
+        return None
 
-    # Query across all calls subcollections
-    # Note: This requires a collection group query
+    # Calls logged before the index existed need a collection group query
     calls = db.collection_group("calls").where("vapiCallId", "==", vapi_call_id).limit(1).stream()
 
-    for call in calls:
+    async for call in calls:
         return {
             "id": call.id,
             "path": call.reference.path,
@@ -80,53 +143,117 @@ async def find_call_by_vapi_id(vapi_call_id: str) -> Optional[dict]:
 
 async def create_order(chat_id: str, order_data: dict) -> str:
     """Create a new order."""
-    db = get_db()
+    db = get_async_db()
 
     order_ref = db.collection("chats").document(chat_id) \
                   .collection("orders").document()
 
     order_data["createdAt"] = firestore.SERVER_TIMESTAMP
     order_data["updatedAt"] = firestore.SERVER_TIMESTAMP
-    order_ref.set(order_data)
+    await order_ref.set(order_data)
 
     return order_ref.id
 
 
 async def update_order(chat_id: str, order_id: str, updates: dict):
     """Update an order."""
-    db = get_db()
+    db = get_async_db()
 
     order_ref = db.collection("chats").document(chat_id) \
                   .collection("orders").document(order_id)
 
     updates["updatedAt"] = firestore.SERVER_TIMESTAMP
-    order_ref.update(updates)
+    if not updates.get("deliveryId"):
+        await order_ref.update(updates)
+        return
+
+    # Index the delivery so DoorDash webhooks can find the order directly
+    batch = db.batch()
+    batch.update(order_ref, updates)
+    batch.set(
+        db.collection("delivery_index").document(updates["deliveryId"]),
+        {"chatId": chat_id, "orderId": order_id},
+    )
+    await batch.commit()
 
 
 async def find_order_by_session(chat_id: str, session_id: str) -> Optional[dict]:
     """Find an existing order by session ID (for multi-turn workflows)."""
-    db = get_db()
+    db = get_async_db()
 
     orders = db.collection("chats").document(chat_id) \
                .collection("orders") \
                .where("sessionId", "==", session_id) \
                .limit(1).stream()
 
-    for doc in orders:
+    async for doc in orders:
         return {"id": doc.id, **doc.to_dict()}
 
     return None
 
 
-async def find_order_by_delivery_id(delivery_id: str) -> Optional[dict]:
-    """Find an order by DoorDash delivery ID (collection group query)."""
-    db = get_db()
+async def upsert_order_by_session(
+    chat_id: str,
+    session_id: str,
+    order_data: dict,
+    update_existing: bool = True,
+) -> tuple[str, bool]:
+    """Update a session's order, or create one if it has none, atomically.
+
+    The lookup and the write run in one transaction, so two turns racing on a
+    new session can't both create an order.
+
+    Args:
+        chat_id: The chat the order belongs to.
+        session_id: The LangGraph session the order tracks.
+        order_data: Fields to write.
+        update_existing: Whether to apply order_data to an existing order;
+            if False, an existing order is left untouched.
+
+    Returns:
+        Tuple of (order_id, created).
+    """
+    db = get_async_db()
+    orders_ref = db.collection("chats").document(chat_id).collection("orders")
+    query = orders_ref.where("sessionId", "==", session_id).limit(1)
+
+    @firestore.async_transactional
+    async def _upsert(transaction) -> tuple[str, bool]:
+        async for doc in await transaction.get(query):
+            if update_existing:
+                transaction.update(doc.reference, {**order_data, "updatedAt": firestore.SERVER_TIMESTAMP})
+            return doc.id, False
+
+        order_ref = orders_ref.document()
+        transaction.set(order_ref, {
+            **order_data,
+            "sessionId": session_id,
+            "createdAt": firestore.SERVER_TIMESTAMP,
+            "updatedAt": firestore.SERVER_TIMESTAMP,
+        })
+        return order_ref.id, True
+
+    return await _upsert(db.transaction())
+
 
+async def find_order_by_delivery_id(delivery_id: str) -> Optional[dict]:
+    """Find an order by DoorDash delivery ID."""
+    db = get_async_db()
+
+    index_doc = await db.collection("delivery_index").document(delivery_id).get()
+    if index_doc.exists:
+        index = index_doc.to_dict()
+        order = await get_order(index["chatId"], index["orderId"])
+        if order:
+            order["chatId"] = index["chatId"]
+        return order
+
+    # Orders dispatched before the index existed need a collection group query
     orders = db.collection_group("orders") \
                .where("deliveryId", "==", delivery_id) \
                .limit(1).stream()
 
-    for doc in orders:
+    async for doc in orders:
         path_parts = doc.reference.path.split("/")
         chat_id = path_parts[1]  # chats/{chatId}/orders/{orderId}
         return {"id": doc.id, "chatId": chat_id, **doc.to_dict()}
@@ -136,12 +263,12 @@ async def find_order_by_delivery_id(delivery_id: str) -> Optional[dict]:
 
 async def get_order(chat_id: str, order_id: str) -> Optional[dict]:
     """Get an order by ID."""
-    db = get_db()
+    db = get_async_db()
 
     order_ref = db.collection("chats").document(chat_id) \
                   .collection("orders").document(order_id)
 
-    doc = order_ref.get()
+    doc = await order_ref.get()
     if doc.exists:
         return {"id": doc.id, **doc.to_dict()}
 
@@ -152,27 +279,79 @@ async def get_order(chat_id: str, order_id: str) -> Optional[dict]:
 
 async def add_message(chat_id: str, role: str, content: str) -> str:
     """Add a message to a chat."""
-    db = get_db()
+    db = get_async_db()
 
-    msg_ref = db.collection("chats").document(chat_id) \
-                .collection("messages").document()
+    chat_ref = db.collection("chats").document(chat_id)
+    msg_ref = chat_ref.collection("messages").document()
 
-    msg_ref.set({
+    # Message and chat's updatedAt go out in one commit
+    batch = db.batch()
+    batch.set(msg_ref, {
         "role": role,
         "content": content,
         "createdAt": firestore.SERVER_TIMESTAMP,
     })
-
-    # Update chat's updatedAt
-    db.collection("chats").document(chat_id).update({
+    batch.update(chat_ref, {
         "updatedAt": firestore.SERVER_TIMESTAMP
     })
+    await batch.commit()
 
     return msg_ref.id
 
 
 # ==================== USER PREFERENCES ====================
 
+# (backend name, Firestore name, default factory) for top-level preference fields
+_PREF_FIELDS = (
+    ("dietary_restrictions", "dietaryRestrictions", list),
+    ("allergies", "allergies", list),
+    ("favorite_cuisines", "favoriteCuisines", list),
+    ("disliked_cuisines", "dislikedCuisines", list),
+    ("spice_preference", "spicePreference", str),
+    ("budget_per_person", "budgetPerPerson", lambda: None),
+)
+
+# (backend name, Firestore name, default label) for saved addresses
+_ADDRESS_FIELDS = (
+    ("work_address", "workAddress", "work"),
+    ("home_address", "homeAddress", "home"),
+)
+
+# (backend name, Firestore name, default) for fields within an address
+_ADDR_FIELDS = (
+    ("raw_address", "rawAddress", ""),
+    ("formatted_address", "formattedAddress", ""),
+    ("latitude", "latitude", None),
+    ("longitude", "longitude", None),
+    ("place_id", "placeId", None),
+)
+
+# Backend spice levels -> values the frontend stores
+_SPICE_TO_FIRESTORE = {
+    "none": "Mild",
+    "mild": "Mild",
+    "medium": "Medium",
+    "hot": "Spicy",
+    "extra_hot": "Extra Spicy",
+}
+
+
+def _address_to_firestore(addr: dict, label: str) -> dict:
+    """Convert a backend address dict to its Firestore (camelCase) form."""
+    mapped = {"label": addr.get("label", label)}
+    for name, fs_name, default in _ADDR_FIELDS:
+        mapped[fs_name] = addr.get(name, default)
+    return mapped
+
+
+def _address_from_firestore(addr: dict, label: str) -> dict:
+    """Convert a Firestore address map to the backend (snake_case) form."""
+    mapped = {"label": addr.get("label", label)}
+    for name, fs_name, default in _ADDR_FIELDS:
+        mapped[name] = addr.get(fs_name, default)
+    return mapped
+
+
 async def update_user_preferences(user_id: str, preferences: dict) -> bool:
     """Update user food preferences in Firebase.
 
@@ -186,69 +365,23 @@ async def update_user_preferences(user_id: str, preferences: dict) -> bool:
     if not user_id:
         return False
 
-    db = get_db()
+    db = get_async_db()
     user_ref = db.collection("users").document(user_id)
 
     # Map preference field names and prepare update
-    update_data = {}
-
-    # Handle dietary restrictions
-    if "dietary_restrictions" in preferences:
-        update_data["dietaryRestrictions"] = preferences["dietary_restrictions"]
-
-    # Handle allergies
-    if "allergies" in preferences:
-        update_data["allergies"] = preferences["allergies"]
-
-    # Handle favorite cuisines
-    if "favorite_cuisines" in preferences:
-        update_data["favoriteCuisines"] = preferences["favorite_cuisines"]
-
-    # Handle disliked cuisines
-    if "disliked_cuisines" in preferences:
-        update_data["dislikedCuisines"] = preferences["disliked_cuisines"]
-
-    # Handle spice preference
-    if "spice_preference" in preferences:
+    update_data = {
+        fs_name: preferences[name]
+        for name, fs_name, _ in _PREF_FIELDS
+        if name in preferences
+    }
+    if "spicePreference" in update_data:
         # Map backend values to frontend values
-        spice_map = {
-            "none": "Mild",
-            "mild": "Mild",
-            "medium": "Medium",
-            "hot": "Spicy",
-            "extra_hot": "Extra Spicy"
-        }
-        update_data["spicePreference"] = spice_map.get(
-            preferences["spice_preference"],
-            preferences["spice_preference"]
-        )
-
-    # Handle budget
-    if "budget_per_person" in preferences:
-        update_data["budgetPerPerson"] = preferences["budget_per_person"]
-
-    # Handle addresses
-    if "work_address" in preferences:
-        addr = preferences["work_address"]
-        update_data["workAddress"] = {
-            "label": addr.get("label", "work"),
-            "rawAddress": addr.get("raw_address", ""),
-            "formattedAddress": addr.get("formatted_address", ""),
-            "latitude": addr.get("latitude"),
-            "longitude": addr.get("longitude"),
-            "placeId": addr.get("place_id"),
-        }
+        spice = update_data["spicePreference"]
+        update_data["spicePreference"] = _SPICE_TO_FIRESTORE.get(spice, spice)
 
-    if "home_address" in preferences:
-        addr = preferences["home_address"]
-        update_data["homeAddress"] = {
-            "label": addr.get("label", "home"),
-            "rawAddress": addr.get("raw_address", ""),
-            "formattedAddress": addr.get("formatted_address", ""),
-            "latitude": addr.get("latitude"),
-            "longitude": addr.get("longitude"),
-            "placeId": addr.get("place_id"),
-        }
+    for name, fs_name, label in _ADDRESS_FIELDS:
+        if name in preferences:
+            update_data[fs_name] = _address_to_firestore(preferences[name], label)
 
     if not update_data:
         return False
@@ -256,37 +389,55 @@ async def update_user_preferences(user_id: str, preferences: dict) -> bool:
     update_data["updatedAt"] = firestore.SERVER_TIMESTAMP
 
     try:
-        user_ref.update(update_data)
+        await user_ref.update(update_data)
+        _user_prefs_cache.pop(user_id)
         return True
     except Exception as e:
-        print(f"Error updating user preferences: {e}")
+        logger.error(f"Error updating user preferences: {e}")
         return False
 
 
 # ==================== INBOUND CALLS ====================
 
+# Fields returned by find_inbound_calls_by_email
+_INBOUND_CALL_SUMMARY_FIELDS = ["callerEmail", "createdAt", "intent", "summary", "status"]
+
+
 async def save_inbound_call(call_id: str, call_data: dict):
     """Save an inbound call record to the inbound_calls collection."""
-    db = get_db()
+    db = get_async_db()
     call_data["createdAt"] = firestore.SERVER_TIMESTAMP
-    db.collection("inbound_calls").document(call_id).set(call_data)
+    await db.collection("inbound_calls").document(call_id).set(call_data)
+    if call_data.get("callerEmail"):
+        _inbound_calls_cache.pop(call_data["callerEmail"])
 
 
 async def find_inbound_calls_by_email(email: str) -> list[dict]:
-    """Find inbound call records by caller email, most recent first."""
-    db = get_db()
+    """Find inbound call records by caller email, most recent first.
+
+    Only the summary fields are fetched (not transcripts). The query needs the
+    inbound_calls (callerEmail ASC, createdAt DESC) composite index from
+    firestore.indexes.json.
+    """
+    cached = _inbound_calls_cache.get(email)
+    if cached is not None:
+        return cached
+
+    db = get_async_db()
     docs = (
         db.collection("inbound_calls")
         .where("callerEmail", "==", email)
         .order_by("createdAt", direction=firestore.Query.DESCENDING)
+        .select(_INBOUND_CALL_SUMMARY_FIELDS)
         .limit(10)
         .stream()
     )
     results = []
-    for doc in docs:
+    async for doc in docs:
         data = doc.to_dict()
         data["id"] = doc.id
         results.append(data)
+    _inbound_calls_cache.set(email, results)
     return results
 
 
@@ -298,19 +449,115 @@ def create_poll_doc(poll_id: str, poll_data: dict):
     db.collection("polls").document(poll_id).set(poll_data)
 
 
-def get_poll_doc(poll_id: str) -> Optional[dict]:
-    """Get a poll document from Firestore."""
+def get_poll_doc(poll_id: str, force_refresh: bool = False) -> Optional[dict]:
+    """Get a poll document from Firestore.
+
+    Args:
+        poll_id: The poll's ID.
+        force_refresh: Read from Firestore, bypassing the cache. Use this when
+            the caller will modify the poll and write it back.
+
+    Returns:
+        The poll dict, or None if it doesn't exist. Unless force_refresh is
+        set, the dict may be shared with other callers and must not be mutated.
+    """
+    if not force_refresh:
+        poll = _poll_cache.get(poll_id)
+        if poll is not None:
+            return poll
+
     db = get_db()
     doc = db.collection("polls").document(poll_id).get()
-    if doc.exists:
+    if not doc.exists:
+        return None
+    if force_refresh:
         return doc.to_dict()
-    return None
+    poll = doc.to_dict()
+    _poll_cache.set(poll_id, poll)
+    return poll
 
 
 def update_poll_doc(poll_id: str, updates: dict):
     """Update a poll document in Firestore."""
     db = get_db()
     db.collection("polls").document(poll_id).update(updates)
+    _poll_cache.pop(poll_id)
+
+
+def record_poll_vote(
+    poll_id: str,
+    voter_id: str,
+    option_id: str,
+    allow_change: bool = True,
+) -> tuple[Optional[dict], bool]:
+    """Record (or change) a voter's choice atomically in a transaction.
+
+    Reading and writing inside one transaction keeps concurrent votes from
+    overwriting each other. All vote paths (Slack and web) go through here so
+    votes share one schema.
+
+    Args:
+        poll_id: The poll's ID.
+        voter_id: Slack user ID or web voter fingerprint.
+        option_id: The chosen option.
+        allow_change: Whether a voter who already voted may switch options.
+            If False, the vote is ignored when the voter already voted or the
+            poll is closed.
+
+    Returns:
+        (poll, applied): the latest poll dict (None if the poll doesn't exist)
+        and whether this vote was recorded.
+    """
+    db = get_db()
+    poll_ref = db.collection("polls").document(poll_id)
+
+    @firestore.transactional
+    def _apply_vote(transaction) -> tuple[Optional[dict], bool]:
+        snapshot = poll_ref.get(transaction=transaction)
+        if not snapshot.exists:
+            return None, False
+
+        poll = snapshot.to_dict()
+
+        # Index options and the voter's existing vote once
+        opts_by_id = {o["option_id"]: o for o in poll["options"]}
+        votes = poll.get("votes", [])
+        voter_idx = next(
+            (i for i, v in enumerate(votes) if v.get("voter_id") == voter_id),
+            None,
+        )
+
+        if not allow_change and (voter_idx is not None or poll.get("is_closed")):
+            return poll, False
+
+        if voter_idx is not None:
+            # Change vote: remove old vote and decrement its option
+            old_option = opts_by_id.get(votes.pop(voter_idx).get("option_id"))
+            if old_option:
+                old_option["votes"] = max(0, old_option["votes"] - 1)
+
+        new_option = opts_by_id.get(option_id)
+        if new_option:
+            new_option["votes"] = new_option.get("votes", 0) + 1
+
+        votes.append({
+            "voter_id": voter_id,
+            "option_id": option_id,
+            "timestamp_ns": time_ns(),
+        })
+
+        poll["votes"] = votes
+        poll["total_votes"] = len(votes)  # One vote per voter
+        transaction.update(poll_ref, {
+            "options": poll["options"],
+            "votes": votes,
+            "total_votes": poll["total_votes"],
+        })
+        return poll, True
+
+    poll, applied = _apply_vote(db.transaction())
+    _poll_cache.pop(poll_id)
+    return poll, applied
 
 
 # ==================== FORMS ====================
@@ -321,26 +568,61 @@ def create_form_doc(form_id: str, form_data: dict):
     db.collection("forms").document(form_id).set(form_data)
 
 
-def get_form_doc(form_id: str) -> Optional[dict]:
-    """Get a form document from Firestore."""
+def get_form_doc(form_id: str, force_refresh: bool = False) -> Optional[dict]:
+    """Get a form document from Firestore.
+
+    Args:
+        form_id: The form's ID.
+        force_refresh: Read from Firestore, bypassing the cache. Use this when
+            the caller will modify the form and write it back.
+
+    Returns:
+        The form dict, or None if it doesn't exist. Unless force_refresh is
+        set, the dict may be shared with other callers and must not be mutated.
+    """
+    if not force_refresh:
+        form = _form_cache.get(form_id)
+        if form is not None:
+            return form
+
     db = get_db()
     doc = db.collection("forms").document(form_id).get()
-    if doc.exists:
+    if not doc.exists:
+        return None
+    if force_refresh:
         return doc.to_dict()
-    return None
+    form = doc.to_dict()
+    _form_cache.set(form_id, form)
+    return form
 
 
 def update_form_doc(form_id: str, updates: dict):
     """Update a form document in Firestore."""
     db = get_db()
     db.collection("forms").document(form_id).update(updates)
+    _form_cache.pop(form_id)
+
 
+def add_form_response(form_id: str, response: dict):
+    """Append a response to a form and bump its count.
 
-async def get_user_preferences(user_id: str) -> Optional[dict]:
+    Uses server-side ArrayUnion/Increment so concurrent submissions don't
+    overwrite each other's responses.
+    """
+    db = get_db()
+    db.collection("forms").document(form_id).update({
+        "responses": firestore.ArrayUnion([response]),
+        "total_responses": firestore.Increment(1),
+    })
+    _form_cache.pop(form_id)
+
+
+async def get_user_preferences(user_id: str, force_refresh: bool = False) -> Optional[dict]:
     """Get user food preferences from Firebase.
 
     Args:
         user_id: The user's Firebase UID.
+        force_refresh: Read from Firestore, bypassing the cache.
 
     Returns:
         User preferences dict if found, None otherwise.
@@ -348,48 +630,30 @@ async def get_user_preferences(user_id: str) -> Optional[dict]:
     if not user_id:
         return None
 
-    db = get_db()
+    if not force_refresh:
+        prefs = _user_prefs_cache.get(user_id)
+        if prefs is not None:
+            return prefs
+
+    db = get_async_db()
     user_ref = db.collection("users").document(user_id)
 
     try:
-        doc = user_ref.get()
+        doc = await user_ref.get()
         if doc.exists:
             data = doc.to_dict()
             # Map Firebase field names to backend field names
             prefs = {
-                "dietary_restrictions": data.get("dietaryRestrictions", []),
-                "allergies": data.get("allergies", []),
-                "favorite_cuisines": data.get("favoriteCuisines", []),
-                "disliked_cuisines": data.get("dislikedCuisines", []),
-                "spice_preference": data.get("spicePreference", ""),
-                "budget_per_person": data.get("budgetPerPerson"),
+                name: data[fs_name] if fs_name in data else default()
+                for name, fs_name, default in _PREF_FIELDS
             }
+            for name, fs_name, label in _ADDRESS_FIELDS:
+                if data.get(fs_name):
+                    prefs[name] = _address_from_firestore(data[fs_name], label)
 
-            # Map address fields
-            work_addr = data.get("workAddress")
-            if work_addr:
-                prefs["work_address"] = {
-                    "label": work_addr.get("label", "work"),
-                    "raw_address": work_addr.get("rawAddress", ""),
-                    "formatted_address": work_addr.get("formattedAddress", ""),
-                    "latitude": work_addr.get("latitude"),
-                    "longitude": work_addr.get("longitude"),
-                    "place_id": work_addr.get("placeId"),
-                }
-
-            home_addr = data.get("homeAddress")
-            if home_addr:
-                prefs["home_address"] = {
-                    "label": home_addr.get("label", "home"),
-                    "raw_address": home_addr.get("rawAddress", ""),
-                    "formatted_address": home_addr.get("formattedAddress", ""),
-                    "latitude": home_addr.get("latitude"),
-                    "longitude": home_addr.get("longitude"),
-                    "place_id": home_addr.get("placeId"),
-                }
-
+            _user_prefs_cache.set(user_id, prefs)
             return prefs
     except Exception as e:
-        print(f"Error getting user preferences: {e}")
+        logger.error(f"Error getting user preferences: {e}")
 
     return None
@@ -1,10 +1,58 @@
 """Notification service for order status updates."""
 
+import asyncio
+import logging
 import os
 import httpx
 from typing import Optional
 from datetime import datetime
 
+try:
+    from integrations.slack.client_pool import create_web_client
+    from integrations.slack.messages import build_tracking_update_blocks, build_receipt_blocks
+    from integrations.slack.rate_limit import slack_call
+    from integrations.slack.session import get_installation, invalidate_installation
+except ImportError:  # Slack dependencies not installed; Slack notifications disabled
+    create_web_client = None
+
+logger = logging.getLogger(__name__)
+
+# DoorDash status -> (notification title, message template)
+_STATUS_TEMPLATES: dict[str, tuple[str, str]] = {
+    "created": ("Order Placed", "Your order from {vendor} has been placed."),
+    "confirmed": ("Order Confirmed", "{vendor} has confirmed your order."),
+    "dasher_confirmed": (
+        "Driver Assigned",
+        "A driver has been assigned to pick up your order from {vendor}.",
+    ),
+    "dasher_confirmed_pickup_arrival": ("Driver Arriving", "Your driver is arriving at {vendor}."),
+    "picked_up": ("Order Picked Up", "Your order from {vendor} is on the way!"),
+    "dasher_confirmed_dropoff_arrival": ("Driver Nearby", "Your driver is almost at your location."),
+    "dropped_off": ("Order Delivered", "Your order from {vendor} has been delivered. Enjoy!"),
+    "cancelled": ("Order Cancelled", "Your order from {vendor} has been cancelled."),
+}
+_DEFAULT_STATUS_TEMPLATE = ("Order Update", "Your order from {vendor} has been updated.")
+
+# DoorDash status -> chat summary line template
+_CHAT_STATUS_TEMPLATES: dict[str, str] = {
+    "dasher_confirmed": "A driver was assigned for {vendor}",
+    "picked_up": "Your order from {vendor} was picked up",
+    "dropped_off": "Your order from {vendor} was delivered",
+    "cancelled": "Your order from {vendor} was cancelled",
+}
+_DEFAULT_CHAT_STATUS_TEMPLATE = "Status update for {vendor}: {status}"
+
+# Slack API errors meaning the workspace's bot token is no longer valid
+_SLACK_AUTH_ERRORS = frozenset({
+    "invalid_auth", "not_authed", "token_revoked", "token_expired", "account_inactive",
+})
+
+
+def _is_slack_auth_error(error: Exception) -> bool:
+    """Whether a Slack API exception was caused by a bad or revoked token."""
+    response = getattr(error, "response", None)
+    return response is not None and response.get("error") in _SLACK_AUTH_ERRORS
+
 
 class NotificationService:
     """Handle push, Slack, and in-chat notifications for order status."""
@@ -17,33 +65,69 @@ class NotificationService:
 
         # Slack client (lazy-initialized)
         self._slack_client = None
+        # Per-workspace Slack clients (team_id -> AsyncWebClient)
+        self._team_clients: dict = {}
+
+        # Pooled HTTP client for push delivery (lazy-initialized)
+        self._http: Optional[httpx.AsyncClient] = None
+
+    def _get_http(self) -> httpx.AsyncClient:
+        """Get the pooled push HTTP client, creating it on first use.
+
+        Reusing one client keeps the TLS connection to the push service alive
+        instead of handshaking for every notification.
+        """
+        if self._http is None or self._http.is_closed:
+            self._http = httpx.AsyncClient(
+                timeout=10.0,
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+            )
+        return self._http
+
+    async def aclose(self):
+        """Close the pooled push HTTP client (called on app shutdown)."""
+        if self._http is not None:
+            await self._http.aclose()
+        self._http = None
 
-    def _get_slack_client(self, team_id: Optional[str] = None):
+    async def _get_slack_client(self, team_id: Optional[str] = None):
         """Get Slack WebClient, optionally for a specific workspace.
 
-        For multi-workspace OAuth, looks up the bot token from Firestore.
-        Falls back to SLACK_BOT_TOKEN env var for backward compat.
+        For multi-workspace OAuth, looks up the bot token from the (cached)
+        workspace installation and reuses one client per workspace until the
+        token changes. Falls back to SLACK_BOT_TOKEN env var for backward compat.
         """
+        if create_web_client is None:
+            return None
+
         if team_id:
             try:
-                from integrations.slack.oauth_store import FirestoreInstallationStore
-                store = FirestoreInstallationStore()
-                installation = store.find_installation(team_id=team_id)
-                if installation and installation.bot_token:
-                    from slack_sdk.web.async_client import AsyncWebClient
-                    return AsyncWebClient(token=installation.bot_token)
+                installation = await get_installation(team_id)
+                bot_token = installation.get("botToken") if installation else None
+                if bot_token:
+                    client = self._team_clients.get(team_id)
+                    if client is None or client.token != bot_token:
+                        client = create_web_client(bot_token)
+                        self._team_clients[team_id] = client
+                    return client
             except Exception:
                 pass
 
         if self._slack_client is None:
             slack_token = os.getenv("SLACK_BOT_TOKEN")
             if slack_token:
-                from slack_sdk.web.async_client import AsyncWebClient
-                self._slack_client = AsyncWebClient(token=slack_token)
+                self._slack_client = create_web_client(slack_token)
         return self._slack_client
 
+    def _forget_team_client(self, team_id: str):
+        """Drop a workspace's client and cached installation after an auth failure."""
+        self._team_clients.pop(team_id, None)
+        invalidate_installation(team_id)
+
     @property
     def slack_enabled(self) -> bool:
+        if create_web_client is None:
+            return False
         return bool(os.getenv("SLACK_BOT_TOKEN") or os.getenv("SLACK_CLIENT_ID"))
 
     async def send_push(
@@ -77,17 +161,15 @@ class NotificationService:
         }
 
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    self.push_url,
-                    json=payload,
-                    headers={
-                        "Authorization": f"Bearer {self.push_token}",
-                        "Content-Type": "application/json",
-                    },
-                    timeout=10.0,
-                )
-                return response.status_code in [200, 201, 202]
+            response = await self._get_http().post(
+                self.push_url,
+                json=payload,
+                headers={
+                    "Authorization": f"Bearer {self.push_token}",
+                    "Content-Type": "application/json",
+                },
+            )
+            return response.status_code in [200, 201, 202]
         except Exception:
             return False
 
@@ -105,45 +187,8 @@ class NotificationService:
         vendor_name = order_data.get("vendor_name", "your restaurant")
         tracking_url = order_data.get("tracking_url", "")
 
-        status_messages = {
-            "created": (
-                "Order Placed",
-                f"Your order from {vendor_name} has been placed."
-            ),
-            "confirmed": (
-                "Order Confirmed",
-                f"{vendor_name} has confirmed your order."
-            ),
-            "dasher_confirmed": (
-                "Driver Assigned",
-                f"A driver has been assigned to pick up your order from {vendor_name}."
-            ),
-            "dasher_confirmed_pickup_arrival": (
-                "Driver Arriving",
-                f"Your driver is arriving at {vendor_name}."
-            ),
-            "picked_up": (
-                "Order Picked Up",
-                f"Your order from {vendor_name} is on the way!"
-            ),
-            "dasher_confirmed_dropoff_arrival": (
-                "Driver Nearby",
-                "Your driver is almost at your location."
-            ),
-            "dropped_off": (
-                "Order Delivered",
-                f"Your order from {vendor_name} has been delivered. Enjoy!"
-            ),
-            "cancelled": (
-                "Order Cancelled",
-                f"Your order from {vendor_name} has been cancelled."
-            ),
-        }
-
-        title, message = status_messages.get(
-            status,
-            ("Order Update", f"Your order from {vendor_name} has been updated.")
-        )
+        title, template = _STATUS_TEMPLATES.get(status, _DEFAULT_STATUS_TEMPLATE)
+        message = template.format(vendor=vendor_name)
 
         if tracking_url and status not in ["dropped_off", "cancelled"]:
             message += f" Track: {tracking_url}"
@@ -170,7 +215,7 @@ class NotificationService:
         Returns:
             True if sent successfully.
         """
-        client = self._get_slack_client(team_id=team_id)
+        client = await self._get_slack_client(team_id=team_id)
         if not client:
             return False
 
@@ -183,10 +228,12 @@ class NotificationService:
             if thread_ts:
                 kwargs["thread_ts"] = thread_ts
 
-            await client.chat_postMessage(**kwargs)
+            await slack_call(team_id or "", client.chat_postMessage(**kwargs))
             return True
         except Exception as e:
-            print(f"Slack message failed: {e}")
+            logger.warning(f"Slack message failed: {e}")
+            if team_id and _is_slack_auth_error(e):
+                self._forget_team_client(team_id)
             return False
 
     async def update_slack_message(
@@ -195,6 +242,7 @@ class NotificationService:
         message_ts: str,
         blocks: list,
         text: str = "",
+        team_id: Optional[str] = None,
     ) -> bool:
         """Update an existing Slack message (for poll results, tracking).
 
@@ -203,24 +251,25 @@ class NotificationService:
             message_ts: Timestamp of the message to update.
             blocks: New Block Kit blocks.
             text: New fallback text.
+            team_id: Workspace ID for multi-workspace token lookup.
 
         Returns:
             True if updated successfully.
         """
-        client = self._get_slack_client()
+        client = await self._get_slack_client(team_id=team_id)
         if not client:
             return False
 
         try:
-            await client.chat_update(
+            await slack_call(team_id or "", client.chat_update(
                 channel=channel_id,
                 ts=message_ts,
                 blocks=blocks,
                 text=text or "Edesia update",
-            )
+            ))
             return True
         except Exception as e:
-            print(f"Slack message update failed: {e}")
+            logger.warning(f"Slack message update failed: {e}")
             return False
 
     async def send_slack_dm(
@@ -228,6 +277,7 @@ class NotificationService:
         slack_user_id: str,
         text: str,
         blocks: Optional[list] = None,
+        team_id: Optional[str] = None,
     ) -> bool:
         """Send a direct message to a Slack user.
 
@@ -235,27 +285,28 @@ class NotificationService:
             slack_user_id: Slack user ID to DM.
             text: Message text.
             blocks: Optional Block Kit blocks.
+            team_id: Workspace ID for multi-workspace token lookup.
 
         Returns:
             True if sent successfully.
         """
-        client = self._get_slack_client()
+        client = await self._get_slack_client(team_id=team_id)
         if not client:
             return False
 
         try:
             # Open a DM channel with the user
-            result = await client.conversations_open(users=[slack_user_id])
+            result = await slack_call(team_id or "", client.conversations_open(users=[slack_user_id]))
             dm_channel = result["channel"]["id"]
 
             kwargs = {"channel": dm_channel, "text": text}
             if blocks:
                 kwargs["blocks"] = blocks
 
-            await client.chat_postMessage(**kwargs)
+            await slack_call(team_id or "", client.chat_postMessage(**kwargs))
             return True
         except Exception as e:
-            print(f"Slack DM failed: {e}")
+            logger.warning(f"Slack DM failed: {e}")
             return False
 
     async def notify_slack_order_status(
@@ -277,8 +328,6 @@ class NotificationService:
         if not slack_context or not self.slack_enabled:
             return False
 
-        from integrations.slack.messages import build_tracking_update_blocks, build_receipt_blocks
-
         channel_id = slack_context.get("channel_id")
         thread_ts = slack_context.get("thread_ts")
         finance_channel_id = slack_context.get("finance_channel_id")
@@ -287,14 +336,29 @@ class NotificationService:
         if not channel_id:
             return False
 
-        # Post tracking update to the order channel
+        async def _post_receipt() -> bool:
+            # The finance channel is looked up here rather than on every
+            # Slack event that saves the context.
+            receipt_channel_id = finance_channel_id
+            if not receipt_channel_id and team_id:
+                installation = await get_installation(team_id)
+                if installation:
+                    receipt_channel_id = installation.get("financeChannelId")
+            if not receipt_channel_id:
+                return False
+            receipt_blocks = build_receipt_blocks(order_data)
+            return await self.send_slack_message(receipt_channel_id, receipt_blocks, text="Order receipt", team_id=team_id)
+
+        # Post tracking update to the order channel and, on delivery, the
+        # receipt to the finance channel; the two posts are independent.
         blocks = build_tracking_update_blocks(status, order_data)
-        await self.send_slack_message(channel_id, blocks, thread_ts=thread_ts, team_id=team_id)
+        posts = [self.send_slack_message(channel_id, blocks, thread_ts=thread_ts, team_id=team_id)]
+        if status == "dropped_off":
+            posts.append(_post_receipt())
 
-        # On delivery, post receipt to finance channel
-        if status == "dropped_off" and finance_channel_id:
-            receipt_blocks = build_receipt_blocks(order_data)
-            await self.send_slack_message(finance_channel_id, receipt_blocks, text="Order receipt", team_id=team_id)
+        for result in await asyncio.gather(*posts, return_exceptions=True):
+            if isinstance(result, Exception):
+                logger.warning(f"Slack order status notification failed: {result}")
 
         return True
 
@@ -347,22 +411,11 @@ def get_status_summary_for_chat(order_updates: list[dict]) -> str:
     if not order_updates:
         return ""
 
-    summaries = []
-    for update in order_updates:
-        status = update.get("status")
-        vendor = update.get("vendor_name", "your order")
-        timestamp = update.get("timestamp", "")
-
-        status_text = {
-            "dasher_confirmed": f"A driver was assigned for {vendor}",
-            "picked_up": f"Your order from {vendor} was picked up",
-            "dropped_off": f"Your order from {vendor} was delivered",
-            "cancelled": f"Your order from {vendor} was cancelled",
-        }.get(status, f"Status update for {vendor}: {status}")
-
-        summaries.append(f"- {status_text}")
-
-    if summaries:
-        return "**Order Updates:**\n" + "\n".join(summaries) + "\n\n---\n\n"
-
-    return ""
+    lines = "\n".join(
+        "- " + _CHAT_STATUS_TEMPLATES.get(update.get("status"), _DEFAULT_CHAT_STATUS_TEMPLATE).format(
+            vendor=update.get("vendor_name", "your order"),
+            status=update.get("status"),
+        )
+        for update in order_updates
+    )
+    return f"**Order Updates:**\n{lines}\n\n---\n\n"
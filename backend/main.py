@@ -50,11 +50,12 @@ orders_dict = modal.Dict.from_name("edesia-orders", create_if_missing=True)
 def fastapi_app():
     """Modal ASGI entrypoint."""
     import weave
-    from fastapi import FastAPI, HTTPException, Request, Form, Response, File, UploadFile
+    from fastapi import FastAPI, HTTPException, Request, Form, Response, File, UploadFile, BackgroundTasks
     from fastapi.middleware.cors import CORSMiddleware
     from fastapi.responses import HTMLResponse, RedirectResponse, StreamingResponse
     from fastapi.templating import Jinja2Templates
     from pydantic import BaseModel
+    import asyncio
     import hashlib
     import json
     import os
@@ -64,9 +65,9 @@ def fastapi_app():
     from lib.redis import get_checkpointer, get_async_checkpointer
     from lib.firebase import (
         get_db,
-        get_poll_doc, create_poll_doc, update_poll_doc,
-        get_form_doc, update_form_doc,
-        create_order, update_order, find_order_by_session, find_order_by_delivery_id,
+        get_poll_doc, create_poll_doc, record_poll_vote,
+        get_form_doc, add_form_response,
+        create_order, update_order, upsert_order_by_session, find_order_by_delivery_id,
     )
 
     # Initialize Weave
@@ -90,6 +91,19 @@ def fastapi_app():
         allow_headers=["*"],
     )
 
+    @web_app.middleware("http")
+    async def gcal_credentials_scope(request: Request, call_next):
+        """Scope the Google credential cache to a single request."""
+        from integrations.gcal.auth import reset_credentials_cache
+        reset_credentials_cache()
+        return await call_next(request)
+
+    @web_app.on_event("shutdown")
+    async def close_notification_connections():
+        """Close the pooled push notification HTTP client."""
+        from lib.notifications import notification_service
+        await notification_service.aclose()
+
     class MessageHistoryItem(BaseModel):
         role: str
         content: str
@@ -352,24 +366,13 @@ def fastapi_app():
                 poem_stage = _get_food_order_poem_stage(food_order, pending_actions)
                 order_data = _build_food_order_data(food_order, poem_stage)
 
-                existing = await find_order_by_session(chat_id, session_id)
-                if existing:
-                    if user_id:
-                        order_data["userId"] = user_id
-                    order_data["chatId"] = chat_id
-                    await update_order(chat_id, existing["id"], order_data)
-                    for action in pending_actions:
-                        action["firestore_order_id"] = existing["id"]
-                        action["chat_id"] = chat_id
-                else:
-                    order_data["sessionId"] = session_id
-                    if user_id:
-                        order_data["userId"] = user_id
-                    order_data["chatId"] = chat_id
-                    order_id = await create_order(chat_id, order_data)
-                    for action in pending_actions:
-                        action["firestore_order_id"] = order_id
-                        action["chat_id"] = chat_id
+                if user_id:
+                    order_data["userId"] = user_id
+                order_data["chatId"] = chat_id
+                order_id, _ = await upsert_order_by_session(chat_id, session_id, order_data)
+                for action in pending_actions:
+                    action["firestore_order_id"] = order_id
+                    action["chat_id"] = chat_id
                 return
 
             # Single-step actions (reservation, catering, poll, call)
@@ -402,19 +405,19 @@ def fastapi_app():
             if not pending_actions and should_create_plan:
                 # Override intent for food-related messages misclassified as "general"
                 plan_intent = intent if intent in PLANNABLE_INTENTS else "food_order"
-                existing = await find_order_by_session(chat_id, session_id)
-                if not existing:
-                    plan_data = _build_plan_from_intent(plan_intent, user_message)
-                    plan_data["sessionId"] = session_id
-                    if user_id:
-                        plan_data["userId"] = user_id
-                    plan_data["chatId"] = chat_id
-                    order_id = await create_order(chat_id, plan_data)
+                plan_data = _build_plan_from_intent(plan_intent, user_message)
+                if user_id:
+                    plan_data["userId"] = user_id
+                plan_data["chatId"] = chat_id
+                order_id, created = await upsert_order_by_session(
+                    chat_id, session_id, plan_data, update_existing=False,
+                )
+                if created:
                     print(f"[POEM] Created plan order {order_id} for intent={plan_intent} (original={intent})")
                     return {"action": "created_plan", "order_id": order_id, "intent": plan_intent, "chat_id": chat_id}
                 else:
                     print(f"[POEM] Plan already exists for session {session_id[:12]}...")
-                    return {"action": "plan_exists", "order_id": existing["id"], "chat_id": chat_id}
+                    return {"action": "plan_exists", "order_id": order_id, "chat_id": chat_id}
             else:
                 reason = f"intent={intent}, is_food={is_food_related if 'is_food_related' in dir() else 'n/a'}, pending={len(pending_actions)}"
                 print(f"[POEM] No plan created: {reason}")
@@ -1124,7 +1127,7 @@ def fastapi_app():
     @web_app.get("/polls/{poll_id}")
     async def get_poll(poll_id: str):
         """Get poll status and results."""
-        poll = get_poll_doc(poll_id)
+        poll = await asyncio.to_thread(get_poll_doc, poll_id)
         if not poll:
             raise HTTPException(status_code=404, detail="Poll not found")
         return poll
@@ -1132,9 +1135,7 @@ def fastapi_app():
     @web_app.post("/polls/{poll_id}/vote")
     async def vote_poll(poll_id: str, request: VoteRequest):
         """Submit a vote to a poll."""
-        from datetime import datetime
-
-        poll = get_poll_doc(poll_id)
+        poll = await asyncio.to_thread(get_poll_doc, poll_id)
         if not poll:
             raise HTTPException(status_code=404, detail="Poll not found")
 
@@ -1145,18 +1146,15 @@ def fastapi_app():
         if existing_votes:
             raise HTTPException(status_code=400, detail="Already voted")
 
-        poll.setdefault("votes", []).append({
-            "voter_id": request.voter_id,
-            "option_id": request.option_id,
-            "timestamp": datetime.utcnow().isoformat(),
-        })
-
-        for option in poll["options"]:
-            if option["option_id"] == request.option_id:
-                option["votes"] = option.get("votes", 0) + 1
-                break
-
-        update_poll_doc(poll_id, {"votes": poll["votes"], "options": poll["options"]})
+        # The transaction re-checks both conditions against the latest poll
+        latest, applied = await asyncio.to_thread(
+            record_poll_vote, poll_id, request.voter_id, request.option_id, allow_change=False,
+        )
+        if not latest:
+            raise HTTPException(status_code=404, detail="Poll not found")
+        if not applied:
+            detail = "Poll is closed" if latest.get("is_closed") else "Already voted"
+            raise HTTPException(status_code=400, detail=detail)
         return {"status": "voted", "poll_id": poll_id}
 
     @web_app.post("/transcribe")
@@ -1294,18 +1292,18 @@ def fastapi_app():
     @web_app.post("/webhooks/vapi/tool-calls")
     async def vapi_tool_calls(request: dict):
         """Handle VAPI tool-call requests during inbound voice calls."""
-        from integrations.vapi.inbound_tools import INBOUND_TOOL_HANDLERS
+        from integrations.vapi.inbound_tools import dispatch_many
 
         message = request.get("message", {})
         call = message.get("call", {})
         call_id = call.get("id", "")
         tool_call_list = message.get("toolCallList", [])
 
-        results = []
+        tc_ids = []
+        tool_calls = []
         for tool_call in tool_call_list:
-            tc_id = tool_call.get("id", "")
+            tc_ids.append(tool_call.get("id", ""))
             fn = tool_call.get("function", {})
-            tool_name = fn.get("name", "")
             params = fn.get("arguments", {})
             if isinstance(params, str):
                 import json as _json
@@ -1313,27 +1311,26 @@ def fastapi_app():
                     params = _json.loads(params)
                 except Exception:
                     params = {}
+            tool_calls.append((fn.get("name", ""), params))
 
-            handler = INBOUND_TOOL_HANDLERS.get(tool_name)
-            if handler:
-                try:
-                    result = await handler(
-                        params,
-                        call_id=call_id,
-                        calls_dict=calls_dict,
-                    )
-                except Exception as e:
-                    print(f"[VAPI-INBOUND] Tool {tool_name} error: {e}")
-                    result = f'{{"error": "Tool error: {e}"}}'
-            else:
-                result = f'{{"error": "Unknown tool: {tool_name}"}}'
-
-            results.append({"toolCallId": tc_id, "result": result})
+        # Independent tool calls in one turn run concurrently
+        outputs = await dispatch_many(tool_calls, call_id=call_id, calls_dict=calls_dict)
+        results = [
+            {"toolCallId": tc_id, "result": result}
+            for tc_id, result in zip(tc_ids, outputs)
+        ]
 
         return {"results": results}
 
+    async def _background_write(log_prefix: str, write, *args):
+        """Run a non-critical Firestore write after the response is sent, logging failures."""
+        try:
+            await write(*args)
+        except Exception as e:
+            print(f"{log_prefix} Background Firestore write failed: {e}")
+
     @web_app.post("/webhooks/vapi")
-    async def vapi_webhook(request: dict):
+    async def vapi_webhook(request: dict, background_tasks: BackgroundTasks):
         """Handle Vapi call webhooks for status updates and transcripts."""
         from datetime import datetime
         from lib.firebase import get_db
@@ -1414,8 +1411,9 @@ def fastapi_app():
                         "followUpNeeded": structured.get("followUpNeeded", False),
                         "endedAt": datetime.utcnow().isoformat(),
                     }
-                    await save_inbound_call(call_id, inbound_doc)
-                    print(f"[VAPI-INBOUND] Saved inbound call {call_id} to Firestore")
+                    # Archival only; nothing below depends on it
+                    background_tasks.add_task(_background_write, "[VAPI-INBOUND]", save_inbound_call, call_id, inbound_doc)
+                    print(f"[VAPI-INBOUND] Queued inbound call {call_id} for Firestore")
                 except Exception as e:
                     print(f"[VAPI-INBOUND] Error saving inbound call to Firestore: {e}")
 
@@ -1428,7 +1426,8 @@ def fastapi_app():
                                  .collection("calls").document(call_id)
 
                     from firebase_admin import firestore as fs
-                    call_ref.set({
+                    batch = db.batch()
+                    batch.set(call_ref, {
                         "vapiCallId": call_id,
                         "direction": "outbound",
                         "phoneNumber": call.get("customer", {}).get("number", ""),
@@ -1440,6 +1439,11 @@ def fastapi_app():
                         "createdAt": fs.SERVER_TIMESTAMP,
                         "endedAt": fs.SERVER_TIMESTAMP,
                     })
+                    batch.set(
+                        db.collection("vapi_call_index").document(call_id),
+                        {"path": call_ref.path},
+                    )
+                    batch.commit()
                 except Exception as e:
                     print(f"[VAPI] Error writing call to Firestore: {e}")
 
@@ -1458,8 +1462,8 @@ def fastapi_app():
                     if end_reason and end_reason != "unknown":
                         msg += f"**End reason:** {end_reason}\n"
 
-                    await add_message(chat_id, "assistant", msg)
-                    print(f"[VAPI] Posted call summary to chat {chat_id}")
+                    background_tasks.add_task(_background_write, "[VAPI]", add_message, chat_id, "assistant", msg)
+                    print(f"[VAPI] Queued call summary for chat {chat_id}")
                 except Exception as e:
                     print(f"[VAPI] Error posting call summary to chat: {e}")
 
@@ -2138,7 +2142,7 @@ def fastapi_app():
     @web_app.get("/p/{poll_id}", response_class=HTMLResponse)
     async def poll_vote_page(request: Request, poll_id: str):
         """Shareable poll voting page."""
-        poll = get_poll_doc(poll_id)
+        poll = await asyncio.to_thread(get_poll_doc, poll_id)
         if not poll:
             raise HTTPException(status_code=404, detail="Poll not found")
 
@@ -2156,9 +2160,7 @@ def fastapi_app():
     @web_app.post("/p/{poll_id}/vote")
     async def poll_vote_submit(request: Request, poll_id: str, option_id: str = Form(...)):
         """Handle vote submission from the poll page."""
-        from datetime import datetime
-
-        poll = get_poll_doc(poll_id)
+        poll = await asyncio.to_thread(get_poll_doc, poll_id)
         if not poll:
             raise HTTPException(status_code=404, detail="Poll not found")
 
@@ -2171,20 +2173,14 @@ def fastapi_app():
         if any(v.get("voter_id") == voter_id for v in poll.get("votes", [])):
             return RedirectResponse(url=f"/p/{poll_id}", status_code=303)
 
-        # Record the vote
-        poll.setdefault("votes", []).append({
-            "voter_id": voter_id,
-            "option_id": option_id,
-            "timestamp": datetime.utcnow().isoformat(),
-        })
-
-        # Update option vote count
-        for option in poll.get("options", []):
-            if option.get("option_id") == option_id:
-                option["votes"] = option.get("votes", 0) + 1
-                break
-
-        update_poll_doc(poll_id, {"votes": poll["votes"], "options": poll["options"]})
+        # Record the vote (the transaction re-checks closed/already voted)
+        latest, applied = await asyncio.to_thread(
+            record_poll_vote, poll_id, voter_id, option_id, allow_change=False,
+        )
+        if not latest:
+            raise HTTPException(status_code=404, detail="Poll not found")
+        if not applied:
+            return RedirectResponse(url=f"/p/{poll_id}", status_code=303)
 
         # Redirect to results page
         return RedirectResponse(url=f"/p/{poll_id}/results", status_code=303)
@@ -2192,7 +2188,7 @@ def fastapi_app():
     @web_app.get("/p/{poll_id}/results", response_class=HTMLResponse)
     async def poll_results_page(request: Request, poll_id: str):
         """Poll results page with live updates."""
-        poll = get_poll_doc(poll_id)
+        poll = await asyncio.to_thread(get_poll_doc, poll_id)
         if not poll:
             raise HTTPException(status_code=404, detail="Poll not found")
 
@@ -2237,7 +2233,7 @@ def fastapi_app():
     @web_app.get("/f/{form_id}", response_class=HTMLResponse)
     async def dietary_form_page(request: Request, form_id: str):
         """Shareable dietary intake form page."""
-        form = get_form_doc(form_id)
+        form = await asyncio.to_thread(get_form_doc, form_id)
         if not form:
             raise HTTPException(status_code=404, detail="Form not found")
 
@@ -2262,7 +2258,7 @@ def fastapi_app():
         from datetime import datetime
         import uuid as uuid_mod
 
-        form = get_form_doc(form_id)
+        form = await asyncio.to_thread(get_form_doc, form_id, force_refresh=True)
         if not form:
             raise HTTPException(status_code=404, detail="Form not found")
 
@@ -2304,12 +2300,7 @@ def fastapi_app():
         }
 
         # Append response
-        responses = form.get("responses", [])
-        responses.append(response_data)
-        update_form_doc(form_id, {
-            "responses": responses,
-            "total_responses": len(responses),
-        })
+        await asyncio.to_thread(add_form_response, form_id, response_data)
 
         return RedirectResponse(url=f"/f/{form_id}/results", status_code=303)
 
@@ -2318,7 +2309,7 @@ def fastapi_app():
         """Dietary form results page with aggregated data."""
         from collections import Counter
 
-        form = get_form_doc(form_id)
+        form = await asyncio.to_thread(get_form_doc, form_id)
         if not form:
             raise HTTPException(status_code=404, detail="Form not found")
 
@@ -2655,25 +2646,25 @@ def fastapi_app():
     try:
         import os
         if os.getenv("SLACK_CLIENT_ID") and os.getenv("SLACK_SIGNING_SECRET"):
-            from integrations.slack.app import slack_handler, register_handlers
+            from integrations.slack.app import handle_slack_request, register_handlers
             register_handlers()
 
             # OAuth install flow
             @web_app.get("/slack/install")
             async def slack_install(request: Request):
                 """Redirect to Slack's OAuth authorize page."""
-                return await slack_handler.handle(request)
+                return await handle_slack_request(request)
 
             @web_app.get("/slack/oauth/callback")
             async def slack_oauth_callback(request: Request):
                 """Handle OAuth callback — exchanges code for bot token, saves to Firestore."""
-                return await slack_handler.handle(request)
+                return await handle_slack_request(request)
 
             # Slack event endpoints
             @web_app.post("/slack/commands")
             async def slack_commands(request: Request):
                 """Handle Slack slash commands (/lunch, /poll)."""
-                return await slack_handler.handle(request)
+                return await handle_slack_request(request)
 
             @web_app.post("/slack/events")
             async def slack_events(request: Request):
@@ -2690,12 +2681,18 @@ def fastapi_app():
                 async def receive():
                     return {"type": "http.request", "body": json.dumps(body).encode()}
                 patched_request = StarletteRequest(scope, receive)
-                return await slack_handler.handle(patched_request)
+                return await handle_slack_request(patched_request)
 
             @web_app.post("/slack/interactions")
             async def slack_interactions(request: Request):
                 """Handle Slack interactive components (buttons, modals)."""
-                return await slack_handler.handle(request)
+                return await handle_slack_request(request)
+
+            @web_app.on_event("shutdown")
+            async def close_slack_connections():
+                """Close the pooled Slack HTTP session."""
+                from integrations.slack.client_pool import close_shared_session
+                await close_shared_session()
 
             print("[SLACK] Slack integration enabled (OAuth multi-workspace)")
         else:
@@ -31,6 +31,7 @@ class PollVote(BaseModel):
     voter_id: str
     option_id: str
     timestamp: datetime = Field(default_factory=datetime.utcnow)
+    timestamp_ns: Optional[int] = None  # What record_poll_vote stores; timestamp is not persisted
 
 
 class Poll(BaseModel):
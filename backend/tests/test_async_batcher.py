@@ -0,0 +1,45 @@
+"""Tests for KVBatcher flushing into a Modal-Dict-like target."""
+
+import asyncio
+import unittest
+
+from integrations.slack.async_batcher import KVBatcher
+
+
+class _KeywordOnlyUpdate:
+    """Stands in for modal's `Dict.update.aio`, which only accepts **kwargs."""
+
+    def __init__(self, store: dict):
+        self._store = store
+        self.calls = 0
+
+    async def aio(self, **kwargs):
+        self.calls += 1
+        self._store.update(kwargs)
+
+
+class _FakeDict:
+    def __init__(self):
+        self.store: dict = {}
+        self.update = _KeywordOnlyUpdate(self.store)
+
+
+class KVBatcherTest(unittest.IsolatedAsyncioTestCase):
+    async def test_flush_uses_keyword_update(self):
+        target = _FakeDict()
+
+        batcher = KVBatcher(lambda: target, max_delay=0.01)
+        await asyncio.gather(
+            batcher.put("action-1", {"status": "approved"}),
+            batcher.put("action-2", {"status": "rejected"}),
+        )
+
+        self.assertEqual(target.update.calls, 1)
+        self.assertEqual(target.store, {
+            "action-1": {"status": "approved"},
+            "action-2": {"status": "rejected"},
+        })
+
+
+if __name__ == "__main__":
+    unittest.main()